@@ -1,72 +1,29 @@
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
+from functools import partial
 
-def draw_customer(min, max):
-    return np.random.randint(min, max + 1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from stochsim.parallel import parallel_replications
+from stochsim.bretzel import (
+    draw_customer, draw_bretzel_per_costumer, calculate_revenue, one_day_simulation, segmented_sum,
+    simulate_days, pdf_bretzels_per_day, compute_cdf, uniform_pmf, compound_pmf,
+    pmf_bretzels_per_day, expected_profit, optimal_production,
+)
 
 
-def draw_bretzel_per_costumer(min, max, customers):
-    return np.random.randint(min, max + 1, customers)
-
-
-def calculate_revenue(sold_bretzels, price_per_bretzel):
-    return sold_bretzels * price_per_bretzel
-
-def one_day_simulation(num_bretzels_produced, min_customer=0, max_customer=8, min_bretzels_per_customer=1, max_bretzels_per_customer=3, price_per_bretzel=1.5):
-    """
-    Simulate one day of bretzel sales.
-
-    Parameters:
-    num_bretzels_produced (int): Number of bretzels produced.
-    min_customer (int): Minimum number of customers.
-    max_customer (int): Maximum number of customers.
-    min_bretzels_per_customer (int): Minimum number of bretzels per customer.
-    max_bretzels_per_customer (int): Maximum number of bretzels per customer.
-    price_per_bretzel (float): Price per bretzel.
-
-    Returns:
-    float: Total cost/profit for the day.
-    """
-    num_customers = draw_customer(min_customer, max_customer)
-    bretzels_per_customer = draw_bretzel_per_costumer(min_bretzels_per_customer, max_bretzels_per_customer, num_customers)
-
-    sold_bretzels = min(num_bretzels_produced, np.sum(bretzels_per_customer))
-    revenue = calculate_revenue(sold_bretzels, price_per_bretzel)
-    leftovers = num_bretzels_produced - sold_bretzels
-    total_profit = - num_bretzels_produced * 1 + revenue + leftovers * 0.75
-
-    return total_profit
-
-
-def pdf_bretzels_per_day(k, pdf0, pdf1, pdf2):
-    # recursively calculate the pdf of bretzels sold per day through P(X=k) = 1/3 * P(X=k-1) + 1/3 * P(X=k-2) + 1/3 * P(X=k-3)
-    if k == 0:
-        return pdf0
-    elif k == 1:
-        return pdf1
-    elif k == 2:
-        return pdf2
-    else:
-        return (pdf_bretzels_per_day(k - 1, pdf0, pdf1, pdf2) +
-                pdf_bretzels_per_day(k - 2, pdf0, pdf1, pdf2) +
-                pdf_bretzels_per_day(k - 3, pdf0, pdf1, pdf2)) / 3
-    
-def compute_cdf(pdf_values):
-    cdf_values = np.cumsum(pdf_values)
-    return cdf_values
-
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     N = 10000
     max_num_bretzels_produced = 24
-    profit_list = []
-    for num_bretzels_produced in range(1, max_num_bretzels_produced + 1):
-        total_profit = 0    
-        for i in range(N):
-            total_profit += one_day_simulation(num_bretzels_produced)
-        profit_list.append(total_profit / N)
+    profit_list, profit_variance, _ = parallel_replications(partial(simulate_days, np.arange(1, max_num_bretzels_produced + 1)), N, seed=0, block_size=2500, axis=1)
 
     print(f"Optimal scenario: Producing {np.argmax(profit_list) + 1} bretzels with an average profit of {max(profit_list):.2f} euros.")
 
+    exact_q, exact_profit = optimal_production(pmf_bretzels_per_day())
+    print(f"Exact solution: Producing {exact_q} bretzels with an expected profit of {exact_profit:.2f} euros.")
+
     plt.plot(range(1, max_num_bretzels_produced + 1), profit_list)
     plt.xlabel("Number of bretzels produced")
     plt.ylabel("Average Profit")
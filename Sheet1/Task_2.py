@@ -1,21 +1,21 @@
-import numpy as np
-import matplotlib.pyplot as plt
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from stochsim.lcg import lcg_random, LCG
 
-def lcg_random(x0, a, c, m):
-    return (a * x0 + c) % m
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(2, 2)
     
     param_list = [[0, 133, 7, 432], [1, 109, 5, 216], [0, 4, 2, 243], [1, 41, 11, 1000]] # Form [seed, a, c, m]
     for axis, params in zip(ax.flatten(), param_list):
         x0, a, c, m = params
-        random_numbers = []
-        for i in range(m):
-            x0 = lcg_random(x0, a, c, m) 
-            random_numbers.append(x0/m)
-        plot_vectors = [(random_numbers[i], random_numbers[i+1]) for i in range(len(random_numbers)-1)]
-        axis.scatter(*zip(*plot_vectors), s=1)
-        axis.set_title(f"LCG with a={a}, c={c}, m={m}")
+        generator = LCG(x0, a, c, m)
+        random_numbers = generator.random(m)
+        axis.scatter(random_numbers[:-1], random_numbers[1:], s=1)
+        axis.set_title(f"LCG with a={a}, c={c}, m={m}" + (" (full period)" if generator.has_full_period() else ""))
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
@@ -1,20 +1,27 @@
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
 
-def middle_square_method(seed):
-    squared = str(seed ** 2).zfill(8)  # Square the seed and pad with zeros
-    middle_digits = squared[2:6]  # Extract the middle four digits
-    return int(middle_digits)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from stochsim.middle_square import (
+    middle_square_method, middle_square_step, middle_square_orbits, middle_square_cycles,
+)
+
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    # Analyze the whole state space of 4-digit seeds
+    all_seeds = np.arange(1000, 10000)
+    mu, lam = middle_square_cycles(all_seeds)
+    print(f"Longest tail: {mu.max()} (seed {all_seeds[np.argmax(mu)]}), mean tail length: {mu.mean():.2f}")
+    print(f"Cycle lengths: {dict(zip(*np.unique(lam, return_counts=True)))}")
+    print(f"Longest period before repeating (tail + cycle): {(mu + lam).max()}")
+
     # Generate random numbers using the Middle Square Method
     seeds = np.linspace(1000, 9999, num=12, dtype=int)  # Generate 5 different 4-digit seeds
-    for seed in seeds:
-        random_numbers = [seed]
-        for _ in range(200):
-            seed = middle_square_method(seed)
-            random_numbers.append(seed)
-
+    orbits = middle_square_orbits(seeds, 200)
+    for random_numbers in orbits.T:
         # Plot the random numbers
         plt.figure(figsize=(10, 5))
         plt.plot(random_numbers, marker='o')
@@ -22,4 +29,4 @@ if __name__ == "__main__":
         plt.xlabel("Iteration")
         plt.ylabel("Random Number")
         plt.grid()
-        plt.show()
\ No newline at end of file
+        plt.show()
@@ -1,21 +1,14 @@
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
 
-
-def draw_exponential_distribution(lam, size=1000):
-    """
-    Draw samples from an exponential distribution and plot the histogram.
-
-    Parameters:
-    lam (float): The rate parameter (lambda) of the exponential distribution.
-    size (int): The number of samples to draw.
-    """
-    samples = np.random.exponential(1/lam, size)
-
-    return samples
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from stochsim.cdf import draw_exponential_distribution, EmpiricalCDF
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     z_n = 5
     lam = 1.0
 
@@ -26,9 +19,7 @@ if __name__ == "__main__":
         Y_z_list.append(z * X_z)
 
     y_values = np.linspace(0, 30, 1000)
-    estimator = np.empty_like(y_values, dtype=float)
-    for i, y in enumerate(y_values):
-        estimator[i] = sum(np.sum(Y_z <= y) for Y_z in Y_z_list) / n
+    estimator = EmpiricalCDF(Y_z_list)(y_values)
 
     plt.plot(y_values, estimator, label='Empirical CDF', color='blue')
     plt.title('Empirical CDF of Mixture of Exponential Distributions')
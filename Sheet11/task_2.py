@@ -1,50 +1,17 @@
-import numpy as np
-import matplotlib.pyplot as plt
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from stochsim.sequential import sequential_monte_carlo
+from stochsim.importance import (
+    g, f_tilde, F_tilde_inv, importance_sampling_weights, importance_sampling,
+    classical_monte_carlo_weights, classical_monte_carlo,
+)
 
-## Script to estimate theta = int_0^1 exp(x^2) dx = E(g(x)), where g(x) = exp(x^2) and x ~ U(0,1)
-
-def g(x):
-    return np.exp(x**2)
-
-def f_tilde(x, task=2):
-    if task == 2:
-        return 2 * x
-    elif task == 3:
-        return np.exp(x)/(np.exp(1)-1)
-    else:
-        raise ValueError("Invalid task number. Use 2 or 3.")
-    
-def F_tilde_inv(u, task=2):
-    if task == 2:
-        return np.sqrt(u)
-    elif task == 3:
-        return np.log(u * (np.exp(1)-1) + 1)
-    else:
-        raise ValueError("Invalid task number. Use 2 or 3.")
-    
-def importance_sampling(num_samples=10000, task=2):
-    u_samples = np.random.uniform(0, 1, num_samples)
-    x_samples = F_tilde_inv(u_samples, task=task)
-    weights = g(x_samples) / f_tilde(x_samples, task=task)
-    theta_estimate = np.mean(weights)
-
-    # Variance
-    variance = np.var(weights) / num_samples
-
-    # Running mean
-    running_mean = np.cumsum(weights) / np.arange(1, num_samples + 1)
-    return theta_estimate, variance, running_mean
-
-def classical_monte_carlo(num_samples=10000):
-    x_samples = np.random.uniform(0, 1, num_samples)
-    g_values = g(x_samples)
-    theta_estimate = np.mean(g_values)
-    variance = np.var(g_values) / num_samples
-    running_mean = np.cumsum(g_values) / np.arange(1, num_samples + 1)
-    return theta_estimate, variance, running_mean
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     num_samples = 10000
 
     theta_classical = classical_monte_carlo(num_samples=num_samples)
@@ -55,6 +22,13 @@ if __name__ == "__main__":
     print(f"Importance Sampling (task 2) estimate: {theta_importance_task2[0]}, Variance: {theta_importance_task2[1]}")
     print(f"Importance Sampling (task 3) estimate: {theta_importance_task3[0]}, Variance: {theta_importance_task3[1]}")
 
+    # Fixed accuracy instead of fixed cost: stop at a 95% confidence half-width of 1e-3
+    for name, weight_generator in [("Classical MC", classical_monte_carlo_weights),
+                                   ("Importance Sampling (task 2)", lambda n: importance_sampling_weights(n, task=2)),
+                                   ("Importance Sampling (task 3)", lambda n: importance_sampling_weights(n, task=3))]:
+        estimate, variance, samples_used = sequential_monte_carlo(weight_generator, abs_tol=1e-3)
+        print(f"{name} to +-1e-3: estimate {estimate}, Variance: {variance}, samples used: {samples_used}")
+
     # Plotting of the running means
     plt.figure(figsize=(12, 6))
     plt.plot(theta_classical[2], label='Classical MC', alpha=0.7)
@@ -1,51 +1,30 @@
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from stochsim.rng import get_rng
+from stochsim.sequential import sequential_monte_carlo
+from stochsim.importance import classical_monte_carlo, classical_monte_carlo_weights, g
+from stochsim.tilted import (
+    log_normalizer, tilted_mean, tilted_density, F_tilde_inv_tilted, second_moment_estimates,
+    tune_tilt, importance_sampling_weights, importance_sampling, theta_estimators, tilted_sampler,
+)
+from stochsim.variance_reduction import compare_estimators
 
-## Script to estimate theta = int_0^1 exp(x^2) dx = E(g(x)), where g(x) = exp(x^2) and x ~ U(0,1)
-
-def g(x):
-    return np.exp(x**2)
-    
-def tilted_density(x, t):
-    return t / (np.exp(t) - 1) * np.exp(t * x)
-
-def F_tilde_inv_tilted(u, t):
-    return (1 / t) * np.log(u * (np.exp(t) - 1) + 1)
-    
-def importance_sampling(num_samples=10000, t=1):
-    u_samples = np.random.uniform(0, 1, num_samples)
-    x_samples = F_tilde_inv_tilted(u_samples, t)
-    weights = g(x_samples) / tilted_density(x_samples, t)
-    theta_estimate = np.mean(weights)
-
-    # Variance
-    variance = np.var(weights) / num_samples
-
-    # Running mean
-    running_mean = np.cumsum(weights) / np.arange(1, num_samples + 1)
-    return theta_estimate, variance, running_mean
-
-def classical_monte_carlo(num_samples=10000):
-    x_samples = np.random.uniform(0, 1, num_samples)
-    g_values = g(x_samples)
-    theta_estimate = np.mean(g_values)
-    variance = np.var(g_values) / num_samples
-    running_mean = np.cumsum(g_values) / np.arange(1, num_samples + 1)
-    return theta_estimate, variance, running_mean
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     num_samples = 10000
     t_list = np.linspace(-2, 3, 50)
-    variance_list = []
-    for t in t_list:
-
-        # theta_classical = classical_monte_carlo(num_samples=num_samples)
-        theta_importance = importance_sampling(num_samples=num_samples, t=t)
-        variance_list.append(theta_importance[1])
 
-        # print(f"Classical Monte Carlo estimate (t = {t}): {theta_classical[0]}, Variance: {theta_classical[1]}")
-        print(f"Importance Sampling estimate (t = {t}): {theta_importance[0]}, Variance: {theta_importance[1]}")
+    # one pilot sample from the uniform density, reweighted to every t
+    x_pilot = get_rng().uniform(0, 1, num_samples)
+    theta_pilot = np.mean(g(x_pilot))
+    variance_list = (second_moment_estimates(t_list, x_pilot) - theta_pilot**2) / num_samples
+    for t, variance in zip(t_list, variance_list):
+        print(f"Importance Sampling variance estimate (t = {t}): {variance}")
 
     # Plot variance vs t
     plt.figure(figsize=(10, 5))
@@ -57,9 +36,23 @@ if __name__ == "__main__":
     plt.show()
 
     # Plot best t
-    best_t = t_list[np.argmin(variance_list)]
+    best_t = tune_tilt()
     print(f"Best t value minimizing variance: {best_t}")
     theta_importance = importance_sampling(num_samples=num_samples, t=best_t)
+    print(f"Importance Sampling estimate (t = {best_t}): {theta_importance[0]}, Variance: {theta_importance[1]}")
+    estimate, variance, samples_used = sequential_monte_carlo(lambda n: importance_sampling_weights(n, best_t), abs_tol=1e-4)
+    print(f"Importance Sampling to +-1e-4 (t = {best_t}): {estimate}, Variance: {variance}, samples used: {samples_used}")
+
+    # The proposal can also be drawn without its inverse CDF, by adaptive rejection sampling
+    sampler = tilted_sampler(best_t)
+    x_ars = sampler.sample(num_samples)
+    print(f"ARS draws from f_t (t = {best_t}): mean {np.mean(x_ars):.4f} (exact {tilted_mean(best_t):.4f}), "
+          f"acceptance rate {sampler.acceptance_rate:.4f}, hull points {sampler.x.size}")
+
+    # Variance reduction layers stacked on the proposals, compared by variance x CPU time
+    for row in compare_estimators(theta_estimators(best_t), 10**6):
+        print(f"{row['name']:46s} estimate {row['estimate']:.6f}, Variance: {row['variance']:.3e}, "
+              f"time {row['seconds']:.3f}s, efficiency x{row['relative_efficiency']:.1f}")
 
 
 
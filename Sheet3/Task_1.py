@@ -1,31 +1,14 @@
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-
-
-def is_in_ellipsoid(a, b, c, r, point):
-    x, y, z = point
-    return (x**2) * a + (y**2) * b + (z**2) * c < r
-
-
-def acception_rejection(a, b, c, r, number_of_sample_points):
-    accepted_points = []
-    rejected_points_count = 0
-    while len(accepted_points) < number_of_sample_points:
-        x_new = np.random.uniform(- np.sqrt(r/a), np.sqrt(r/a))
-        y_new = np.random.uniform(- np.sqrt(r/b), np.sqrt(r/b))
-        z_new = np.random.uniform(- np.sqrt(r/c), np.sqrt(r/c))
-        new_point = (x_new, y_new, z_new)
-        if is_in_ellipsoid(a, b, c, r, new_point):
-            accepted_points.append(new_point)
-        else:
-            rejected_points_count += 1
-    print(f"Number of accepted points: {len(accepted_points)}")
-    print(f"Number of rejected points: {rejected_points_count}")
-    probability = number_of_sample_points / (number_of_sample_points + rejected_points_count)
-    return accepted_points, probability
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from stochsim.ellipsoid import is_in_ellipsoid, acception_rejection, block_acceptance_rejection
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     a = 0.25
     b = 1
     c = 4
@@ -36,13 +19,14 @@ if __name__ == "__main__":
 
     N = 10000
 
-    accepted_points, probability = acception_rejection(a, b, c, r, N)
+    accepted_points, probability = block_acceptance_rejection([a, b, c], r, N)
+    print(f"Number of accepted points: {len(accepted_points)}")
+    print(f"Number of rejected points: {round(N / probability) - N}")
 
     estimated_volume = probability * cube_volume
     print(f"Estimated Volume of the Ellipsoid: {estimated_volume}. Actual Volume: {ellipsoid_volume}")
 
     # Visualization
-    accepted_points = np.array(accepted_points)
     fig = plt.figure()
     ax = fig.add_subplot(111, projection='3d')
     ax.scatter(accepted_points[:, 0], accepted_points[:, 1], accepted_points[:, 2], s=1)
@@ -0,0 +1,10 @@
+"""
+Sampling and Monte Carlo routines of the exercise sheets.
+
+The compute modules only depend on numpy at import time (scipy is imported inside the few
+functions that need it, matplotlib is only used by the sheet scripts), so importing the
+package stays cheap for worker processes and short jobs.
+"""
+from .parallel import merge_moments, parallel_replications
+from .rng import BIT_GENERATORS, get_rng, make_rng, register_bit_generator, set_default_rng
+from .sequential import sequential_monte_carlo
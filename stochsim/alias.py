@@ -0,0 +1,138 @@
+import numpy as np
+from functools import lru_cache
+
+from .instrument import instrumented, record
+from .rng import get_rng
+
+
+def find_lowest_index_greater_zero(Q):
+    Q = np.asarray(Q)
+    pos = Q > 0
+    if not pos.any():
+        raise ValueError("no positive entries > 0")
+    i1 = int(np.argmin(np.where(pos, Q, np.inf)))
+    return i1
+
+def find_highest_index_greater_zero(Q):
+    Q = np.asarray(Q)
+    pos = Q > 0
+    if not pos.any():
+        raise ValueError("no positive entries > 0")
+    j1 = int(np.argmax(np.where(pos, Q, -np.inf)))
+    return j1
+
+
+def alias_method_decomposition(P):
+    m = np.size(P)
+    q_list = []
+    P_list = []
+    ik_indexes = []
+    jk_indexes = []
+    k = 1
+    q1 = np.zeros_like(P)
+    i1 = find_lowest_index_greater_zero(P)
+    j1 = find_highest_index_greater_zero(P)
+    q1[i1] = (m - 1) * P[i1] 
+    q1[j1] = 1 - q1[i1]
+    q_list.append(q1)
+    P_list.append((m - 1) / (m - 2) *(P - 1 / (m - 1) * q1))
+    ik_indexes.append(i1)
+    jk_indexes.append(j1)
+
+    while (k < m - 2 and int(np.count_nonzero(P_list[-1])) > 2):
+        k += 1
+        P_last = P_list[-1]
+        ik = find_lowest_index_greater_zero(P_last)
+        ik_indexes.append(ik)
+        jk = find_highest_index_greater_zero(P_last)
+        jk_indexes.append(jk)
+        q_new = np.zeros_like(P)
+        q_new[ik] = (m - k) * P_list[-1][ik]
+        q_new[jk] = 1 - q_new[ik]
+        q_list.append(q_new)
+        P_list.append((m - k) / (m - k - 1) *(P_list[-1] - 1 / (m - k) * q_new))
+    
+    q_list.append(P_list[-1])
+    ik_indexes.append(find_lowest_index_greater_zero(P_list[-1]))
+    jk_indexes.append(find_highest_index_greater_zero(P_list[-1]))
+
+    if not np.allclose(np.asarray(P), 1 / (m - 1) * np.sum(q_list, axis=0)):
+        raise ValueError("Decomposition error")
+    
+
+    return q_list, ik_indexes, jk_indexes
+
+@instrumented()
+def sample_from_decomposition(P, rng=None):
+    rng = get_rng(rng)
+    record("sample_from_decomposition", uniforms=2)
+    q_list, ik_indexes, jk_indexes = alias_method_decomposition(P)
+    u1 = rng.uniform(0, 1)
+    u2 = rng.uniform(0, 1)
+    m = np.size(q_list[0])
+    k = np.ceil(u1 * (m - 1)).astype(int) - 1 
+    ik = ik_indexes[k]
+    jk = jk_indexes[k]
+
+    if (u2 <= q_list[k][ik]):
+        return ik
+    else:
+        return jk
+
+
+class AliasTable:
+    """
+    Alias table for sampling from a finite distribution, built in O(m) with Vose's method.
+
+    The table consists of m columns, column i keeps index i with probability prob[i] and
+    otherwise returns alias[i]. Use AliasTable.from_probabilities to reuse the tables of the
+    TABLE_CACHE_SIZE most recently used probability vectors.
+    """
+
+    @instrumented("AliasTable.build", variates=lambda result: 0)
+    def __init__(self, P):
+        P = np.asarray(P, dtype=float)
+        m = P.size
+        scaled = P * m / P.sum()
+        self.prob = np.ones(m)
+        self.alias = np.arange(m)
+
+        small = [i for i in range(m) if scaled[i] < 1]
+        large = [i for i in range(m) if scaled[i] >= 1]
+        while small and large:
+            i = small.pop()
+            j = large.pop()
+            self.prob[i] = scaled[i]
+            self.alias[i] = j
+            scaled[j] -= 1 - scaled[i]
+            if scaled[j] < 1:
+                small.append(j)
+            else:
+                large.append(j)
+        record("AliasTable.build", iterations=m)
+        # entries left in either list are 1 up to rounding and keep prob 1
+
+    @staticmethod
+    def from_probabilities(P):
+        return _cached_table(np.ascontiguousarray(P, dtype=float).tobytes())
+
+    @instrumented()
+    def sample(self, n, rng=None):
+        """
+        Draw n samples using two uniform arrays.
+        """
+        rng = get_rng(rng)
+        record("AliasTable.sample", uniforms=2 * n)
+        m = self.prob.size
+        columns = np.minimum((rng.random(n) * m).astype(np.int64), m - 1)
+        keep = rng.random(n) < self.prob[columns]
+        return np.where(keep, columns, self.alias[columns])
+
+
+TABLE_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _cached_table(P_bytes):
+    # keyed by the raw bytes of the probability vector, least recently used tables are dropped
+    return AliasTable(np.frombuffer(P_bytes))
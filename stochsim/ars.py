@@ -0,0 +1,190 @@
+import numpy as np
+
+from .instrument import instrumented, record
+from .rng import get_rng
+
+
+## Adaptive rejection sampling (Gilks & Wild 1992) for log-concave densities on an interval
+
+
+class AdaptiveRejectionSampler:
+    """
+    Sampler for a density proportional to exp(log_density(x)) on domain, log_density concave.
+
+    The upper hull is the piecewise linear envelope of the tangents of log_density at the
+    abscissae, exp(hull) is piecewise exponential and is sampled by inversion. The lower hull
+    (chords between abscissae) is a squeeze: candidates below it are accepted without
+    evaluating log_density. Candidates are drawn in vectorized batches, and points at which
+    log_density had to be evaluated are added to the abscissae after every batch, so the
+    hull tightens and the acceptance rate approaches 1.
+
+    Parameters:
+    log_density (callable): Vectorized log of the unnormalized density.
+    domain (tuple): (lower, upper), infinite bounds allowed. Truncated targets just use a
+        finite domain.
+    initial_points (array_like): At least two abscissae inside the domain. For an unbounded
+        side, the derivative of log_density at the outermost point must point inwards.
+        Defaults to 3 interior points of a finite domain.
+    dlog_density (callable): Vectorized derivative of log_density, central differences if None.
+    max_points (int): The hull is no longer refined beyond this many abscissae.
+    """
+
+    def __init__(self, log_density, domain=(-np.inf, np.inf), initial_points=None, dlog_density=None, max_points=50):
+        self.log_density = log_density
+        self.dlog_density = dlog_density
+        self.lower, self.upper = float(domain[0]), float(domain[1])
+        self.max_points = max_points
+        if initial_points is None:
+            if not (np.isfinite(self.lower) and np.isfinite(self.upper)):
+                raise ValueError("initial_points are required on an unbounded domain.")
+            initial_points = self.lower + (self.upper - self.lower) * np.array([0.1, 0.5, 0.9])
+        x = np.unique(np.asarray(initial_points, dtype=float))
+        if x.size < 2 or x[0] <= self.lower or x[-1] >= self.upper:
+            raise ValueError("Need at least two distinct initial points strictly inside the domain.")
+        h = np.asarray(log_density(x), dtype=float)
+        dh = self._derivative(x)
+        if not (np.all(np.isfinite(h)) and np.all(np.isfinite(dh))):
+            raise ValueError("log_density and its derivative must be finite at the initial points.")
+        if not np.isfinite(self.lower) and dh[0] <= 0:
+            raise ValueError("The derivative at the smallest initial point must be positive on an unbounded lower side.")
+        if not np.isfinite(self.upper) and dh[-1] >= 0:
+            raise ValueError("The derivative at the largest initial point must be negative on an unbounded upper side.")
+        self.x = np.empty(0)
+        self.h = np.empty(0)
+        self.dh = np.empty(0)
+        self._add_points(x, h, dh)
+        self.proposals = 0
+        self.accepted = 0
+        self.evaluations = 0
+
+    def _derivative(self, x):
+        if self.dlog_density is not None:
+            return np.asarray(self.dlog_density(x), dtype=float)
+        step = 1e-6 * (1 + np.abs(x))
+        with np.errstate(invalid="ignore"):
+            return (self.log_density(x + step) - self.log_density(x - step)) / (2 * step)
+
+    def _add_points(self, x_new, h_new, dh_new):
+        x = np.concatenate((self.x, x_new))
+        h = np.concatenate((self.h, h_new))
+        dh = np.concatenate((self.dh, dh_new))
+        x, index = np.unique(x, return_index=True)
+        self.x, self.h, self.dh = x, h[index], dh[index]
+        if np.any(np.diff(self.dh) > 1e-8 * (1 + np.abs(self.dh[1:]))):
+            raise ValueError("log_density is not concave (its derivative increases).")
+        self._build_hull()
+
+    def _build_hull(self):
+        x, h, dh = self.x, self.h, self.dh
+        # intersections of neighbouring tangents, the midpoint where the tangents coincide
+        slope_change = dh[:-1] - dh[1:]
+        parallel = np.abs(slope_change) < 1e-12 * (1 + np.abs(dh[:-1]))
+        z_inner = np.where(parallel, 0.5 * (x[:-1] + x[1:]),
+                           (h[1:] - h[:-1] - x[1:] * dh[1:] + x[:-1] * dh[:-1]) / np.where(parallel, 1.0, slope_change))
+        z_inner = np.clip(z_inner, x[:-1], x[1:])
+        self.z = np.concatenate(([self.lower], z_inner, [self.upper]))
+
+        # log of the mass of exp(hull) over every segment [z_j, z_{j+1}]
+        left, right = self.z[:-1], self.z[1:]
+        length = right - left
+        s = dh
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            positive = h + (right - x) * s + np.log(-np.expm1(-s * length) / s)
+            negative = h + (left - x) * s + np.log(np.expm1(s * length) / s)
+            flat = h + np.log(length)
+        log_mass = np.where(s > 0, positive, np.where(s < 0, negative, flat))
+        self.log_total = np.max(log_mass) + np.log(np.sum(np.exp(log_mass - np.max(log_mass))))
+        if not np.isfinite(self.log_total):
+            raise ValueError("The upper hull cannot be normalized (infinite or undefined mass).")
+        self.cumulative = np.cumsum(np.exp(log_mass - self.log_total))
+        self.cumulative[-1] = 1.0
+
+    def _sample_hull(self, U, V):
+        # segment by V, position inside the segment by inversion of the exponential with U
+        j = np.minimum(np.searchsorted(self.cumulative, V), self.x.size - 1)
+        left, right, s = self.z[j], self.z[j + 1], self.dh[j]
+        length = right - left
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            positive = right + np.log1p((1 - U) * np.expm1(-s * length)) / s
+            negative = left + np.log1p(U * np.expm1(s * length)) / s
+            flat = left + U * length
+        return np.where(s > 0, positive, np.where(s < 0, negative, flat)), j
+
+    def _lower_hull(self, x):
+        i = np.searchsorted(self.x, x) - 1
+        inside = (i >= 0) & (i < self.x.size - 1)
+        i = np.clip(i, 0, self.x.size - 2)
+        x0, x1 = self.x[i], self.x[i + 1]
+        chord = ((x1 - x) * self.h[i] + (x - x0) * self.h[i + 1]) / (x1 - x0)
+        return np.where(inside, chord, -np.inf)
+
+    @instrumented()
+    def sample(self, size, rng=None, min_batch_size=256, new_points_per_batch=8, max_batch_size=2**20,
+               max_batches_without_acceptance=100):
+        """
+        Draw size samples.
+
+        Parameters:
+        size (int): Number of samples.
+        rng (np.random.Generator): Random number generator, the shared default if None.
+        min_batch_size (int): Smallest number of candidates per batch.
+        new_points_per_batch (int): Abscissae added to the hull after every batch.
+        max_batch_size (int): Largest number of candidates per batch, bounds the memory.
+        max_batches_without_acceptance (int): A RuntimeError is raised after this many batches
+            in a row without an accepted candidate, instead of looping forever.
+        """
+        rng = get_rng(rng)
+        samples = np.empty(size)
+        count = 0
+        proposals = evaluations = batches = batches_without_acceptance = 0
+        acceptance_rate = 0.5
+        while count < size:
+            missing = size - count
+            batch_size = min(max(min_batch_size, int(1.1 * missing / acceptance_rate)), max_batch_size)
+            if self.x.size < self.max_points:
+                # small, growing batches while the hull is refined, so most candidates come
+                # from a tight hull
+                batch_size = min(batch_size, min_batch_size << batches)
+            U, V, W = rng.random((3, batch_size))
+            x, j = self._sample_hull(U, V)
+            upper = self.h[j] + (x - self.x[j]) * self.dh[j]
+            log_w = np.log(W)
+            accept = log_w <= self._lower_hull(x) - upper
+            check = np.flatnonzero(~accept)
+            h_check = np.asarray(self.log_density(x[check]), dtype=float)
+            accept[check] = log_w[check] <= h_check - upper[check]
+
+            accepted = np.flatnonzero(accept)[:missing]
+            used = accepted[-1] + 1 if accepted.size == missing else batch_size
+            samples[count:count + accepted.size] = x[accepted]
+            count += accepted.size
+            proposals += used
+            evaluations += np.count_nonzero(check < used)
+            batches += 1
+            acceptance_rate = max(count, 1) / proposals
+
+            if accepted.size:
+                batches_without_acceptance = 0
+            else:
+                batches_without_acceptance += 1
+                if batches_without_acceptance == max_batches_without_acceptance:
+                    raise RuntimeError(f"No candidate accepted in {max_batches_without_acceptance} batches, "
+                                       "log_density is -inf or far below the hull almost everywhere.")
+
+            if self.x.size < self.max_points and check.size:
+                new = rng.choice(check.size, min(new_points_per_batch, check.size, self.max_points - self.x.size), replace=False)
+                x_new, h_new = x[check[new]], h_check[new]
+                dh_new = self._derivative(x_new)
+                finite = np.isfinite(h_new) & np.isfinite(dh_new)
+                self._add_points(x_new[finite], h_new[finite], dh_new[finite])
+
+        self.proposals += proposals
+        self.accepted += size
+        self.evaluations += evaluations
+        record("AdaptiveRejectionSampler.sample", uniforms=3 * proposals, iterations=batches, proposals=proposals, accepted=size)
+        return samples
+
+    @property
+    def acceptance_rate(self):
+        """Fraction of accepted proposals over all sample calls so far."""
+        return self.accepted / self.proposals if self.proposals else None
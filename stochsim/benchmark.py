@@ -0,0 +1,255 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from .rng import make_rng
+
+
+## Benchmark harness for the samplers of all sheets, with JSON output and regression checks
+
+DEFAULT_SIZES = (10**3, 10**4, 10**5, 10**6)
+
+
+def _lcg(n, rng):
+    from .lcg import LCG
+    return LCG(int(rng.integers(2**32)), 1664525, 1013904223, 2**32).random(n)
+
+
+def _middle_square(n, rng):
+    from .middle_square import middle_square_orbits
+    return middle_square_orbits(rng.integers(1000, 10000, n // 10), 10)[-1]
+
+
+def _bretzel(n, rng):
+    from .bretzel import simulate_days
+    return simulate_days([11], n, rng)[0]
+
+
+def _pareto(n, rng):
+    from .pareto import draw_pareto
+    return draw_pareto(n, 3, 2, rng)
+
+
+def _acceptance_rejection(n, rng):
+    from .ellipsoid import block_acceptance_rejection
+    points, _ = block_acceptance_rejection([0.25, 1, 4], 1, n, rng)
+    return points[:, 0]
+
+
+def _binomial(n, rng):
+    from .discrete import DiscreteInverseSampler
+    return DiscreteInverseSampler.binomial(100, 0.6).sample(n, rng)
+
+
+def _negative_binomial(n, rng):
+    from .discrete import DiscreteInverseSampler
+    return DiscreteInverseSampler.negative_binomial(5, 0.7).sample(n, rng)
+
+
+def _poisson_small(n, rng):
+    from .poisson import poisson
+    return poisson(5.0, n, rng)
+
+
+def _poisson_large(n, rng):
+    from .poisson import poisson
+    return poisson(100.0, n, rng)
+
+
+def _alias(n, rng):
+    from .alias import AliasTable
+    from .discrete import binomial_log_pmf
+    k = np.arange(101)
+    P = np.exp(binomial_log_pmf(100, 0.6, k))
+    return AliasTable.from_probabilities(P).sample(n, rng)
+
+
+def _equicorrelation_sigma():
+    Sigma = np.full((200, 200), 0.3)
+    Sigma[:100, :100] = 0.8
+    Sigma[100:, 100:] = 0.7
+    np.fill_diagonal(Sigma, 1.0)
+    return Sigma
+
+
+def _mvn(n, rng):
+    from .mvn import MVNSampler
+    return MVNSampler(np.zeros(200), _equicorrelation_sigma()).sample(max(n // 200, 2), rng).ravel()
+
+
+def _mvn_block(n, rng):
+    from .mvn import BlockEquicorrelationSampler
+    return BlockEquicorrelationSampler(np.zeros(200), [100, 100], [0.8, 0.7], 0.3).sample(max(n // 200, 2), rng).ravel()
+
+
+def _classical_mc(n, rng):
+    from .importance import classical_monte_carlo_weights
+    return classical_monte_carlo_weights(n, rng=rng)
+
+
+def _importance_sampling(n, rng):
+    from .importance import importance_sampling_weights
+    return importance_sampling_weights(n, task=3, rng=rng)
+
+
+def _importance_sampling_tilted(n, rng):
+    from .tilted import importance_sampling_weights
+    return importance_sampling_weights(n, t=1.04, rng=rng)
+
+
+def _ars_truncated_normal(n, rng):
+    from .ars import AdaptiveRejectionSampler
+    return AdaptiveRejectionSampler(lambda x: -x**2 / 2, (1.0, 3.0)).sample(n, rng)
+
+
+def _mc_volume(n, rng):
+    from .volume import monte_carlo_volume
+    d = 3
+    m = max(int(round(n ** (1 / d))), 2)
+    estimate, _ = monte_carlo_volume(d, m, rng=rng)
+    return estimate, estimate * (2**d - estimate) / m**d
+
+
+def _qmc_volume(n, rng):
+    from .qmc import rqmc_integral
+    d = 3
+    mean, standard_error = rqmc_integral(lambda U: np.sum((2 * U - 1) ** 2, axis=1) <= 1, d, max(n // 16, 2), seed=int(rng.integers(2**31)))
+    return 2**d * mean, (2**d * standard_error) ** 2
+
+
+# name -> sampler(n, rng). A sampler returns either the n sampled values (the variance of
+# their mean is estimated from them) or a tuple (estimate, variance of the estimate).
+BENCHMARKS = {
+    "lcg": _lcg,
+    "middle_square": _middle_square,
+    "bretzel_days": _bretzel,
+    "pareto": _pareto,
+    "acceptance_rejection_ellipsoid": _acceptance_rejection,
+    "binomial_inversion": _binomial,
+    "negative_binomial_inversion": _negative_binomial,
+    "poisson_table": _poisson_small,
+    "poisson_ptrs": _poisson_large,
+    "alias": _alias,
+    "ars_truncated_normal": _ars_truncated_normal,
+    "mvn_cholesky": _mvn,
+    "mvn_block_factor": _mvn_block,
+    "classical_mc": _classical_mc,
+    "importance_sampling": _importance_sampling,
+    "importance_sampling_tilted": _importance_sampling_tilted,
+    "mc_volume": _mc_volume,
+    "rqmc_volume": _qmc_volume,
+}
+
+
+def run_benchmark(name, size, repeats=3, seed=0):
+    """
+    Time one sampler at one size.
+
+    Returns:
+    dict: seconds (best of repeats), samples_per_sec, peak_bytes (tracemalloc, separate run),
+    variance of the estimate and efficiency = 1 / (variance * seconds).
+    """
+    sampler = BENCHMARKS[name]
+    sampler(min(size, 1000), make_rng(seed))  # warm up imports and caches
+
+    times = []
+    for r in range(repeats):
+        rng = make_rng(seed + r)
+        start = time.perf_counter()
+        output = sampler(size, rng)
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+
+    tracemalloc.start()
+    sampler(size, make_rng(seed))
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if isinstance(output, tuple):
+        variance = float(output[1])
+    else:
+        values = np.asarray(output, dtype=float)
+        variance = float(np.var(values, ddof=1) / values.size)
+    efficiency = 1 / (variance * seconds) if variance > 0 and seconds > 0 else None
+    return {
+        "name": name,
+        "size": size,
+        "seconds": seconds,
+        "samples_per_sec": size / seconds if seconds > 0 else None,
+        "peak_bytes": peak_bytes,
+        "variance": variance,
+        "efficiency": efficiency,
+    }
+
+
+def run_all(names=None, sizes=DEFAULT_SIZES, repeats=3, seed=0):
+    results = []
+    for name in names or BENCHMARKS:
+        for size in sizes:
+            results.append(run_benchmark(name, size, repeats, seed))
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def find_regressions(current, baseline, tolerance=0.25):
+    """
+    Entries whose samples_per_sec dropped by more than tolerance (relative) or whose peak
+    memory grew by more than tolerance compared to the baseline run.
+    """
+    reference = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = reference.get((result["name"], result["size"]))
+        if base is None:
+            continue
+        if base["samples_per_sec"] and result["samples_per_sec"] < (1 - tolerance) * base["samples_per_sec"]:
+            regressions.append((result["name"], result["size"], "samples_per_sec", base["samples_per_sec"], result["samples_per_sec"]))
+        if base["peak_bytes"] and result["peak_bytes"] > (1 + tolerance) * base["peak_bytes"]:
+            regressions.append((result["name"], result["size"], "peak_bytes", base["peak_bytes"], result["peak_bytes"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark all samplers of the exercise sheets.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run_all(args.names, args.sizes, args.repeats, args.seed)
+    for r in results["results"]:
+        efficiency = f"{r['efficiency']:.3g}" if r["efficiency"] is not None else "-"
+        print(f"{r['name']:32s} n={r['size']:>9d}  {r['samples_per_sec']:12.4g} samples/s  "
+              f"peak {r['peak_bytes'] / 2**20:9.2f} MiB  efficiency {efficiency}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for name, size, metric, before, after in regressions:
+            print(f"REGRESSION {name} n={size}: {metric} {before:.4g} -> {after:.4g}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
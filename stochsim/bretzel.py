@@ -0,0 +1,198 @@
+import numpy as np
+from functools import lru_cache
+
+from .instrument import instrumented, record
+from .rng import get_rng
+
+
+def draw_customer(min, max, rng=None):
+    return get_rng(rng).integers(min, max + 1)
+
+
+def draw_bretzel_per_costumer(min, max, customers, rng=None):
+    return get_rng(rng).integers(min, max + 1, customers)
+
+
+def calculate_revenue(sold_bretzels, price_per_bretzel):
+    return sold_bretzels * price_per_bretzel
+
+@instrumented()
+def one_day_simulation(num_bretzels_produced, min_customer=0, max_customer=8, min_bretzels_per_customer=1, max_bretzels_per_customer=3, price_per_bretzel=1.5, rng=None):
+    """
+    Simulate one day of bretzel sales.
+
+    Parameters:
+    num_bretzels_produced (int): Number of bretzels produced.
+    min_customer (int): Minimum number of customers.
+    max_customer (int): Maximum number of customers.
+    min_bretzels_per_customer (int): Minimum number of bretzels per customer.
+    max_bretzels_per_customer (int): Maximum number of bretzels per customer.
+    price_per_bretzel (float): Price per bretzel.
+    rng (np.random.Generator): Random number generator, the shared default if None.
+
+    Returns:
+    float: Total cost/profit for the day.
+    """
+    num_customers = draw_customer(min_customer, max_customer, rng)
+    bretzels_per_customer = draw_bretzel_per_costumer(min_bretzels_per_customer, max_bretzels_per_customer, num_customers, rng)
+    record("one_day_simulation", uniforms=1 + num_customers)
+
+    sold_bretzels = min(num_bretzels_produced, np.sum(bretzels_per_customer))
+    revenue = calculate_revenue(sold_bretzels, price_per_bretzel)
+    leftovers = num_bretzels_produced - sold_bretzels
+    total_profit = - num_bretzels_produced * 1 + revenue + leftovers * 0.75
+
+    return total_profit
+
+
+def segmented_sum(values, segment_lengths):
+    """
+    Sum consecutive segments of a flat array without a Python loop.
+
+    Parameters:
+    values (np.ndarray): Flat array holding all segments back to back.
+    segment_lengths (np.ndarray): Length of every segment (zero lengths are allowed).
+
+    Returns:
+    np.ndarray: Sum over each segment.
+    """
+    cumsum = np.concatenate(([0], np.cumsum(values)))
+    ends = np.cumsum(segment_lengths)
+    return cumsum[ends] - cumsum[ends - segment_lengths]
+
+
+@instrumented()
+def simulate_days(num_bretzels_produced_array, n_days, rng=None, min_customer=0, max_customer=8, min_bretzels_per_customer=1, max_bretzels_per_customer=3, price_per_bretzel=1.5, production_cost=1.0, leftover_price=0.75):
+    """
+    Simulate n_days of bretzel sales for several production levels at once.
+
+    All customer counts and all per-customer demands are drawn as arrays. The daily
+    demand is the segmented sum of the per-customer demands, and every production
+    level is evaluated against the same simulated days (common random numbers).
+
+    Parameters:
+    num_bretzels_produced_array (array_like): Production levels to evaluate.
+    n_days (int): Number of simulated days.
+    rng (np.random.Generator): Random number generator, the shared default if None.
+    min_customer (int): Minimum number of customers.
+    max_customer (int): Maximum number of customers.
+    min_bretzels_per_customer (int): Minimum number of bretzels per customer.
+    max_bretzels_per_customer (int): Maximum number of bretzels per customer.
+    price_per_bretzel (float): Price per bretzel.
+    production_cost (float): Cost of producing one bretzel.
+    leftover_price (float): Price a leftover bretzel is sold for at the end of the day.
+
+    Returns:
+    np.ndarray: Profit matrix of shape (len(num_bretzels_produced_array), n_days).
+    """
+    rng = get_rng(rng)
+    produced = np.asarray(num_bretzels_produced_array).reshape(-1, 1)
+
+    num_customers = rng.integers(min_customer, max_customer + 1, n_days)
+    bretzels_per_customer = rng.integers(min_bretzels_per_customer, max_bretzels_per_customer + 1, num_customers.sum())
+    demand = segmented_sum(bretzels_per_customer, num_customers)
+    record("simulate_days", uniforms=n_days + bretzels_per_customer.size)
+
+    sold_bretzels = np.minimum(produced, demand)
+    revenue = calculate_revenue(sold_bretzels, price_per_bretzel)
+    leftovers = produced - sold_bretzels
+    return - produced * production_cost + revenue + leftovers * leftover_price
+
+
+@lru_cache(maxsize=None)
+def pdf_bretzels_per_day(k, pdf0, pdf1, pdf2):
+    # recursively calculate the pdf of bretzels sold per day through P(X=k) = 1/3 * P(X=k-1) + 1/3 * P(X=k-2) + 1/3 * P(X=k-3)
+    if k == 0:
+        return pdf0
+    elif k == 1:
+        return pdf1
+    elif k == 2:
+        return pdf2
+    else:
+        return (pdf_bretzels_per_day(k - 1, pdf0, pdf1, pdf2) +
+                pdf_bretzels_per_day(k - 2, pdf0, pdf1, pdf2) +
+                pdf_bretzels_per_day(k - 3, pdf0, pdf1, pdf2)) / 3
+    
+def compute_cdf(pdf_values):
+    cdf_values = np.cumsum(pdf_values)
+    return cdf_values
+
+
+def uniform_pmf(min, max):
+    """
+    PMF of the discrete uniform distribution on {min, ..., max}, indexed by value.
+    """
+    pmf = np.zeros(max + 1)
+    pmf[min:] = 1 / (max - min + 1)
+    return pmf
+
+
+def compound_pmf(customer_pmf, bretzels_per_customer_pmf):
+    """
+    Exact PMF of the daily demand D = B_1 + ... + B_C.
+
+    The number of customers C and the bretzels per customer B_i are independent with the
+    given PMFs (indexed by value). The generating function G_D(s) = sum_c P(C=c) G_B(s)^c
+    is evaluated Horner-style, so only max(C) convolutions are needed.
+
+    Parameters:
+    customer_pmf (array_like): P(C=c) for c = 0, ..., max(C).
+    bretzels_per_customer_pmf (array_like): P(B=b) for b = 0, ..., max(B).
+
+    Returns:
+    np.ndarray: P(D=k) for k = 0, ..., max(C) * max(B).
+    """
+    customer_pmf = np.asarray(customer_pmf, dtype=float)
+    bretzels_per_customer_pmf = np.asarray(bretzels_per_customer_pmf, dtype=float)
+    pmf = customer_pmf[-1:]
+    for p_c in customer_pmf[-2::-1]:
+        pmf = np.convolve(pmf, bretzels_per_customer_pmf)
+        pmf[0] += p_c
+    return pmf
+
+
+def pmf_bretzels_per_day(min_customer=0, max_customer=8, min_bretzels_per_customer=1, max_bretzels_per_customer=3):
+    """
+    Exact PMF of the number of bretzels demanded per day in the setting of one_day_simulation.
+    """
+    return compound_pmf(uniform_pmf(min_customer, max_customer),
+                        uniform_pmf(min_bretzels_per_customer, max_bretzels_per_customer))
+
+
+def expected_profit(num_bretzels_produced, demand_pmf, price_per_bretzel=1.5, production_cost=1.0, leftover_price=0.75):
+    """
+    Exact expected daily profit for one or several production levels.
+
+    Uses E[min(q, D)] = sum_{k<q} P(D > k), so the whole profit curve costs one cumsum.
+
+    Parameters:
+    num_bretzels_produced (array_like): Production level(s) q.
+    demand_pmf (array_like): P(D=k) for k = 0, 1, ...
+    price_per_bretzel (float): Price per bretzel.
+    production_cost (float): Cost of producing one bretzel.
+    leftover_price (float): Price a leftover bretzel is sold for at the end of the day.
+
+    Returns:
+    np.ndarray: Expected profit for every production level.
+    """
+    q = np.asarray(num_bretzels_produced)
+    survival = 1 - compute_cdf(demand_pmf)
+    expected_sold = np.concatenate(([0], np.cumsum(survival)))
+    expected_sold = expected_sold[np.minimum(q, survival.size)] + np.maximum(q - survival.size, 0) * survival[-1]
+    return q * (leftover_price - production_cost) + (price_per_bretzel - leftover_price) * expected_sold
+
+
+def optimal_production(demand_pmf, price_per_bretzel=1.5, production_cost=1.0, leftover_price=0.75):
+    """
+    Optimal production level via the newsvendor critical ratio.
+
+    The expected profit is maximised by the smallest q with
+    P(D <= q) >= (price - cost) / (price - leftover price).
+
+    Returns:
+    tuple: (optimal production level, expected profit at that level)
+    """
+    critical_ratio = (price_per_bretzel - production_cost) / (price_per_bretzel - leftover_price)
+    cdf_values = compute_cdf(demand_pmf)
+    q = int(np.searchsorted(cdf_values, critical_ratio - 1e-12))
+    return q, float(expected_profit(q, demand_pmf, price_per_bretzel, production_cost, leftover_price))
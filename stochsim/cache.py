@@ -0,0 +1,249 @@
+import functools
+import glob
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from .rng import make_rng
+
+
+## Content-addressed on-disk cache for sampled arrays and results
+#
+# An entry is keyed by a hash of (function, its source code and that of its module, the
+# installed stochsim version and the sources of all stochsim modules, the parameters, the
+# seed and the bit generator) and stored as a directory
+#
+#   <root>/<key>/record.json   layout of the result and every non-array value
+#   <root>/<key>/<i>.npy       one file per array, large ones are read back with mmap_mode='r'
+#
+# The modification time of record.json is the last access time used for LRU eviction, the
+# total size is capped by ResultCache(max_bytes=...) and ResultCache().clear() empties it.
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "stochsim")
+
+
+def _update_hash(hasher, value):
+    # stable hash of parameters: arrays by content, containers recursively, objects (e.g. a
+    # sampler bound to a method) by their attributes and plain values by repr
+    if isinstance(value, np.ndarray):
+        hasher.update(f"ndarray{value.dtype.str}{value.shape}".encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.random.SeedSequence):
+        hasher.update(f"SeedSequence{value.entropy}{value.spawn_key}".encode())
+    elif isinstance(value, dict):
+        hasher.update(b"dict")
+        for key in sorted(value, key=repr):
+            _update_hash(hasher, key)
+            _update_hash(hasher, value[key])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(type(value).__name__.encode())
+        for item in value:
+            _update_hash(hasher, item)
+    elif value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic, np.dtype)):
+        hasher.update(repr(value).encode())
+    elif isinstance(value, type):
+        # classes such as dtype=np.float32 by their import path
+        hasher.update(f"type {value.__module__}.{value.__qualname__}".encode())
+    elif hasattr(value, "__dict__") and not callable(value):
+        hasher.update(type(value).__qualname__.encode())
+        _update_hash(hasher, vars(value))
+    else:
+        # functions and other objects only have a repr with their memory address, which would
+        # give a new key in every process
+        raise TypeError(f"Cannot derive a stable cache key from {type(value).__qualname__} {value!r}, "
+                        "pass plain values or arrays instead (e.g. the parameters of a callable).")
+    hasher.update(b";")
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Installed version of stochsim plus a hash of the sources of all its modules."""
+    try:
+        version = importlib.metadata.version("stochsim")
+    except importlib.metadata.PackageNotFoundError:
+        version = "not installed"
+    hasher = hashlib.sha1(version.encode())
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        hasher.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            hasher.update(f.read())
+    return f"{version}+{hasher.hexdigest()[:12]}"
+
+
+def function_fingerprint(function):
+    """
+    Module, qualified name and source code of a function (bound methods include their object).
+    Functions outside stochsim also hash the source of their whole module, so edited helpers
+    they call invalidate the cache; changes inside stochsim are covered by code_version.
+    """
+    hasher = hashlib.sha1()
+    target = getattr(function, "__func__", function)
+    hasher.update(f"{target.__module__}.{target.__qualname__}".encode())
+    try:
+        hasher.update(inspect.getsource(target).encode())
+    except (OSError, TypeError):
+        hasher.update(target.__code__.co_code)
+    module = inspect.getmodule(target)
+    if module is not None and module.__name__.split(".")[0] != __package__:
+        try:
+            hasher.update(inspect.getsource(module).encode())
+        except (OSError, TypeError):
+            pass  # e.g. __main__ of an interactive session, only the function source is known
+    if hasattr(function, "__self__"):
+        _update_hash(hasher, function.__self__)
+    return hasher.hexdigest()
+
+
+def cache_key(function, params, seed, bit_generator="pcg64"):
+    """
+    Hex digest identifying the result of function(**params, rng=make_rng(seed, bit_generator)).
+    Raises a TypeError for parameters without a stable hash, e.g. functions.
+    """
+    hasher = hashlib.sha1()
+    hasher.update(function_fingerprint(function).encode())
+    hasher.update(code_version().encode())
+    _update_hash(hasher, params)
+    _update_hash(hasher, seed)
+    hasher.update(bit_generator.lower().encode())
+    return hasher.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache with a size cap and least-recently-used eviction. Every store evicts the
+    least recently used entries beyond max_bytes, clear() removes all entries.
+
+    Parameters:
+    directory (str): Root directory, defaults to $STOCHSIM_CACHE_DIR or ~/.cache/stochsim.
+    max_bytes (int): Size cap of all entries, the least recently used ones are evicted beyond it.
+    mmap_threshold (int): Arrays of at least this many bytes are opened with mmap_mode='r'
+        (read-only and zero-copy), smaller ones are loaded into memory.
+    """
+
+    def __init__(self, directory=None, max_bytes=2**30, mmap_threshold=2**16):
+        self.directory = directory or os.environ.get("STOCHSIM_CACHE_DIR", DEFAULT_DIRECTORY)
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def __contains__(self, key):
+        return os.path.exists(os.path.join(self._path(key), "record.json"))
+
+    def load(self, key):
+        """The cached result for key, None if there is none."""
+        path = self._path(key)
+        record_path = os.path.join(path, "record.json")
+        try:
+            with open(record_path) as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        os.utime(record_path)
+
+        def decode(item):
+            if "array" not in item:
+                return item["value"]
+            mmap_mode = "r" if item["nbytes"] >= self.mmap_threshold else None
+            return np.load(os.path.join(path, item["array"]), mmap_mode=mmap_mode)
+
+        if record["kind"] == "dict":
+            return {key: decode(item) for key, item in zip(record["keys"], record["items"])}
+        items = [decode(item) for item in record["items"]]
+        return tuple(items) if record["kind"] == "tuple" else items[0]
+
+    def store(self, key, result):
+        """
+        Store a result: an array, a scalar or a tuple/dict of them. The entry is written to a
+        temporary directory and renamed, so readers never see a partial entry.
+        """
+        if isinstance(result, dict):
+            kind, keys, values = "dict", list(result), list(result.values())
+        elif isinstance(result, tuple):
+            kind, keys, values = "tuple", None, list(result)
+        else:
+            kind, keys, values = "single", None, [result]
+
+        staging = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        items = []
+        for i, value in enumerate(values):
+            if isinstance(value, np.ndarray):
+                name = f"{i}.npy"
+                np.save(os.path.join(staging, name), value)
+                items.append({"array": name, "nbytes": int(value.nbytes)})
+            else:
+                items.append({"value": value.item() if isinstance(value, np.generic) else value})
+        with open(os.path.join(staging, "record.json"), "w") as f:
+            json.dump({"kind": kind, "keys": keys, "items": items}, f)
+        try:
+            os.replace(staging, self._path(key))
+        except OSError:
+            # another process stored the same key first
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """(last access time, size in bytes, key) of every entry."""
+        entries = []
+        for key in os.listdir(self.directory):
+            path = self._path(key)
+            record_path = os.path.join(path, "record.json")
+            if key.startswith(".") or not os.path.exists(record_path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path))
+            entries.append((os.stat(record_path).st_mtime, size, key))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the total size is within max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._path(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove all entries."""
+        for _, _, key in self.entries():
+            shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def get_or_compute(self, function, params, seed, bit_generator="pcg64"):
+        """
+        Cached function(**params, rng=make_rng(seed, bit_generator)). A seed of None means
+        fresh entropy, such results are not reproducible and are neither cached nor looked up.
+        """
+        if seed is None:
+            return function(**params, rng=make_rng(None, bit_generator))
+        key = cache_key(function, params, seed, bit_generator)
+        result = self.load(key)
+        if result is None:
+            result = function(**params, rng=make_rng(seed, bit_generator))
+            self.store(key, result)
+            # read back so hits and misses return the same (memory-mapped) arrays; an entry
+            # larger than max_bytes is evicted right away and the computed result is returned
+            stored = self.load(key)
+            if stored is not None:
+                result = stored
+        return result
+
+    def cached(self, function):
+        """
+        Decorator: cached(function)(*args, seed=..., bit_generator=..., **kwargs) calls
+        function(*args, **kwargs, rng=make_rng(seed, bit_generator)) through the cache.
+        """
+        parameter_names = list(inspect.signature(function).parameters)
+
+        @functools.wraps(function)
+        def wrapper(*args, seed, bit_generator="pcg64", **kwargs):
+            params = dict(zip(parameter_names, args), **kwargs)
+            return self.get_or_compute(function, params, seed, bit_generator)
+        return wrapper
@@ -0,0 +1,83 @@
+import numpy as np
+
+from .instrument import instrumented, record
+from .rng import get_rng
+
+
+@instrumented()
+def draw_exponential_distribution(lam, size=1000, rng=None):
+    """
+    Draw samples from an exponential distribution and plot the histogram.
+
+    Parameters:
+    lam (float): The rate parameter (lambda) of the exponential distribution.
+    size (int): The number of samples to draw.
+    rng (np.random.Generator): Random number generator, the shared default if None.
+    """
+    samples = get_rng(rng).exponential(1/lam, size)
+    record("draw_exponential_distribution", uniforms=samples.size)
+
+    return samples
+
+
+class EmpiricalCDF:
+    """
+    Empirical CDF of a pooled sample. The samples are sorted once, afterwards any grid of
+    query points costs one np.searchsorted, i.e. O(log n) per query point.
+
+    Parameters:
+    samples (array_like or list of array_like): Sample(s), all arrays are pooled.
+    """
+
+    def __init__(self, samples):
+        if isinstance(samples, (list, tuple)):
+            samples = np.concatenate([np.ravel(s) for s in samples])
+        self.sorted_samples = np.sort(np.ravel(samples))
+        self.n = self.sorted_samples.size
+
+    def __call__(self, y):
+        return np.searchsorted(self.sorted_samples, y, side='right') / self.n
+
+
+def exponential_CDF(y, lam):
+    """
+    Compute the CDF of an exponential distribution at value y.
+
+    Parameters:
+    y (float): The value at which to compute the CDF.
+    lam (float): The rate parameter (lambda) of the exponential distribution.
+
+    Returns:
+    float: The CDF value at y.
+    """
+    if y < 0:
+        return 0.0
+    return 1 - np.exp(-lam * y)
+
+
+def conditional_mc_CDF(y_values, z_samples, tile_size=2**22):
+    """
+    Conditional Monte Carlo estimate F_Y(y) = mean_z P(Y <= y | Z = z) = mean_z (1 - exp(-y / z))
+    for all y at once.
+
+    The (y, z) pairs are evaluated by broadcasting in tiles of at most tile_size entries,
+    so memory stays bounded for large grids and samples.
+
+    Parameters:
+    y_values (array_like): Query points.
+    z_samples (array_like): Samples of the conditional mean Z (scale of the exponential).
+    tile_size (int): Maximum number of (y, z) pairs held in memory at once.
+
+    Returns:
+    np.ndarray: Estimated CDF at every y.
+    """
+    y_values = np.asarray(y_values, dtype=float)
+    rates = 1 / np.asarray(z_samples, dtype=float)
+    z_tile = min(rates.size, tile_size)
+    y_tile = max(1, tile_size // z_tile)
+    estimator = np.zeros_like(y_values)
+    for y_start in range(0, y_values.size, y_tile):
+        y = np.maximum(y_values[y_start:y_start + y_tile, None], 0)
+        for z_start in range(0, rates.size, z_tile):
+            estimator[y_start:y_start + y_tile] -= np.sum(np.expm1(-y * rates[z_start:z_start + z_tile]), axis=1)
+    return estimator / rates.size
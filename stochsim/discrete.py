@@ -0,0 +1,174 @@
+import numpy as np
+from functools import lru_cache
+
+from .instrument import instrumented, record, stage
+from .rng import get_rng
+
+
+def binomial_distribution(n, p, k):
+    """
+    Calculate the probability of getting exactly k successes in n independent Bernoulli trials
+    with success probability p using the binomial distribution formula.
+    """
+    from scipy.special import comb
+    return comb(n, k) * (p ** k) * ((1 - p) ** (n - k))
+
+
+@instrumented()
+def inverse_transform_binomial(n, p, u):
+    """
+    Perform inverse transform sampling to generate a binomially distributed random variable.
+    Given a uniform random variable u in [0, 1), return the corresponding binomial random variable.
+    """
+    cumulative_probability = 0.0
+    for k in range(n + 1):
+        cumulative_probability += binomial_distribution(n, p, k)
+        if cumulative_probability >= u:
+            record("inverse_transform_binomial", iterations=k + 1)
+            return k
+    record("inverse_transform_binomial", iterations=n + 1)
+    return n  # In case u is very close to 1
+
+
+def recursion_binomial_distribution(n, p, k):
+    if k == 0:
+        return (1 - p) ** n
+    elif k == n:
+        return p ** n
+    else:
+        return (n - k + 1) * p / (k * (1 - p)) * recursion_binomial_distribution(n, p, k - 1)
+
+
+@instrumented()
+def recursion_inverse_transform_binomial(n, p, u):
+    k = 0
+    p0 = (1 - p) ** n
+    F = p0
+    while F < u and k < n:
+        k += 1
+        pk = (n - k + 1) * p / (k * (1 - p)) * p0
+        F += pk
+        p0 = pk
+    record("recursion_inverse_transform_binomial", iterations=k + 1)
+    return k
+
+
+def negative_binomial_distribution(r, p, k):
+    """
+    Calculate the probability of getting k failures before r successes in a sequence of independent Bernoulli trials
+    with success probability p using the negative binomial distribution formula.
+    """
+    from scipy.special import comb
+    return comb(k + r - 1, r - 1) * (p ** r) * ((1 - p) ** k)
+
+
+@instrumented()
+def inverse_transform_negative_binomial(r, p, u):
+    """
+    Perform inverse transform sampling to generate a negative binomially distributed random variable.
+    Given a uniform random variable u in [0, 1), return the corresponding negative binomial random variable.
+    """
+    cumulative_probability = 0.0
+    k = 0
+    while True:
+        cumulative_probability += negative_binomial_distribution(r, p, k)
+        if cumulative_probability >= u:
+            record("inverse_transform_negative_binomial", iterations=k + 1)
+            return k
+        k += 1
+
+
+def recursion_negative_binomial_distribution(r, p, k):
+    if k == 0:
+        return p ** r
+    else:
+        return (k + r - 1) / k * (1 - p) * recursion_negative_binomial_distribution(r, p, k - 1)
+
+
+@instrumented()
+def recursion_inverse_transform_negative_binomial(r, p, u):
+    k = 0
+    p0 = p ** r
+    F = p0
+    while F < u:
+        k += 1
+        pk = (k + r - 1) / k * (1 - p) * p0
+        F += pk
+        p0 = pk
+    record("recursion_inverse_transform_negative_binomial", iterations=k + 1)
+    return k
+
+
+def binomial_log_pmf(n, p, k):
+    from scipy.special import gammaln, xlog1py, xlogy
+    # xlogy(0, 0) = 0, so p = 0 and p = 1 give point masses instead of nan
+    return gammaln(n + 1) - gammaln(k + 1) - gammaln(n - k + 1) + xlogy(k, p) + xlog1py(n - k, -p)
+
+
+def negative_binomial_log_pmf(r, p, k):
+    from scipy.special import gammaln, xlog1py, xlogy
+    return gammaln(k + r) - gammaln(k + 1) - gammaln(r) + xlogy(r, p) + xlog1py(k, -p)
+
+
+def poisson_log_pmf(lam, k):
+    from scipy.special import gammaln, xlogy
+    return xlogy(k, lam) - lam - gammaln(k + 1)
+
+
+class DiscreteInverseSampler:
+    """
+    Inverse transform sampling on {0, 1, 2, ...} from a table of CDF values.
+
+    The PMF is evaluated in log-space, the CDF table is built once and a whole array of
+    uniforms is mapped to samples with np.searchsorted in O(log k) per draw. For infinite
+    support the table is doubled lazily until it covers the largest uniform.
+
+    Parameters:
+    log_pmf (callable): Vectorized log P(X=k) for an integer array k.
+    support_size (int): Number of support points for finite support, None for infinite support.
+    initial_size (int): Number of table entries built up front for infinite support.
+    """
+
+    def __init__(self, log_pmf, support_size=None, initial_size=64):
+        self.log_pmf = log_pmf
+        self.support_size = support_size
+        self.cdf = np.empty(0)
+        self._extend(support_size if support_size is not None else initial_size)
+
+    def _extend(self, size):
+        with stage("DiscreteInverseSampler.sample_from_uniforms", "extend table"):
+            k = np.arange(self.cdf.size, self.cdf.size + size)
+            total = self.cdf[-1] if self.cdf.size else 0.0
+            self.cdf = np.concatenate((self.cdf, total + np.cumsum(np.exp(self.log_pmf(k)))))
+
+    @instrumented()
+    def sample_from_uniforms(self, u):
+        u = np.asarray(u)
+        if self.support_size is None:
+            while u.size and np.max(u) > self.cdf[-1]:
+                previous_total = self.cdf[-1]
+                self._extend(self.cdf.size)
+                if self.cdf[-1] == previous_total:  # remaining mass below float resolution
+                    break
+        # binary search steps per draw
+        record("DiscreteInverseSampler.sample_from_uniforms", iterations=u.size * int(np.ceil(np.log2(self.cdf.size + 1))))
+        return np.minimum(np.searchsorted(self.cdf, u), self.cdf.size - 1)
+
+    def sample(self, size, rng=None):
+        record("DiscreteInverseSampler.sample_from_uniforms", uniforms=int(np.prod(size)))
+        return self.sample_from_uniforms(get_rng(rng).random(size))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def binomial(n, p):
+        return DiscreteInverseSampler(lambda k: binomial_log_pmf(n, p, k), support_size=n + 1)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def negative_binomial(r, p):
+        return DiscreteInverseSampler(lambda k: negative_binomial_log_pmf(r, p, k))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def poisson(lam):
+        return DiscreteInverseSampler(lambda k: poisson_log_pmf(lam, k), initial_size=int(lam + 10 * np.sqrt(lam) + 10))
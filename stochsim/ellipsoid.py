@@ -0,0 +1,80 @@
+import numpy as np
+
+from .instrument import instrumented, record
+from .rng import get_rng
+
+
+def is_in_ellipsoid(a, b, c, r, point):
+    x, y, z = point
+    return (x**2) * a + (y**2) * b + (z**2) * c < r
+
+
+@instrumented(variates=lambda result: len(result[0]))
+def acception_rejection(a, b, c, r, number_of_sample_points, rng=None):
+    rng = get_rng(rng)
+    accepted_points = []
+    rejected_points_count = 0
+    while len(accepted_points) < number_of_sample_points:
+        x_new = rng.uniform(- np.sqrt(r/a), np.sqrt(r/a))
+        y_new = rng.uniform(- np.sqrt(r/b), np.sqrt(r/b))
+        z_new = rng.uniform(- np.sqrt(r/c), np.sqrt(r/c))
+        new_point = (x_new, y_new, z_new)
+        if is_in_ellipsoid(a, b, c, r, new_point):
+            accepted_points.append(new_point)
+        else:
+            rejected_points_count += 1
+    proposals = number_of_sample_points + rejected_points_count
+    record("acception_rejection", uniforms=3 * proposals, iterations=proposals, proposals=proposals, accepted=number_of_sample_points)
+    probability = number_of_sample_points / (number_of_sample_points + rejected_points_count)
+    return accepted_points, probability
+
+
+@instrumented(variates=lambda result: len(result[0]))
+def block_acceptance_rejection(weights, r, number_of_sample_points, rng=None, min_batch_size=1024, max_batch_size=2**18):
+    """
+    Sample uniformly from the d-dimensional ellipsoid sum_i weights[i] * x_i^2 < r.
+
+    Candidates are drawn from the bounding box in batches sized from the running acceptance
+    rate and accepted with one vectorized mask. A batch holds at most max_batch_size
+    candidates, so the memory stays bounded when the acceptance rate is tiny (large d).
+    Candidates after the last needed acceptance are discarded uncounted, so the counts match
+    the one-at-a-time acception_rejection.
+
+    Parameters:
+    weights (array_like): Axis weights (a, b, c, ... in the 3d case).
+    r (float): Right-hand side of the ellipsoid inequality.
+    number_of_sample_points (int): Number of points to accept.
+    rng (np.random.Generator): Random number generator, the shared default if None.
+    min_batch_size (int): Smallest number of candidates drawn per batch.
+    max_batch_size (int): Largest number of candidates drawn per batch.
+
+    Returns:
+    tuple: (accepted points of shape (number_of_sample_points, d), acceptance probability).
+    The number of rejected proposals is number_of_sample_points / probability - number_of_sample_points.
+    """
+    rng = get_rng(rng)
+    weights = np.asarray(weights, dtype=float)
+    half_axes = np.sqrt(r / weights)
+    accepted_points = np.empty((number_of_sample_points, weights.size))
+    accepted_count = 0
+    rejected_points_count = 0
+    acceptance_rate = 0.5
+    drawn = 0
+    batches = 0
+    while accepted_count < number_of_sample_points:
+        missing = number_of_sample_points - accepted_count
+        batch_size = min(max(min_batch_size, int(1.1 * missing / acceptance_rate)), max_batch_size)
+        candidates = rng.uniform(-half_axes, half_axes, (batch_size, weights.size))
+        drawn += candidates.size
+        batches += 1
+        inside = (candidates ** 2) @ weights < r
+        accepted_index = np.flatnonzero(inside)[:missing]
+        used = accepted_index[-1] + 1 if accepted_index.size == missing else batch_size
+        accepted_points[accepted_count:accepted_count + accepted_index.size] = candidates[accepted_index]
+        accepted_count += accepted_index.size
+        rejected_points_count += used - accepted_index.size
+        acceptance_rate = max(accepted_count, 1) / (accepted_count + rejected_points_count)
+    record("block_acceptance_rejection", uniforms=drawn, iterations=batches,
+           proposals=accepted_count + rejected_points_count, accepted=accepted_count)
+    probability = number_of_sample_points / (number_of_sample_points + rejected_points_count)
+    return accepted_points, probability
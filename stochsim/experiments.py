@@ -0,0 +1,409 @@
+import argparse
+import ast
+import contextlib
+import csv
+import itertools
+import os
+import sys
+import time
+import numpy as np
+
+from .cache import ResultCache
+from .instrument import profiling
+from .rng import make_rng
+
+
+## Command-line runner for the experiments of the sheets, with parameter overrides and sweeps
+#
+#   python -m stochsim.experiments bretzel --set n_days=100000 --output bretzel.csv
+#   python -m stochsim.experiments is_tilt --grid t=-2:3:50 --workers 8 --output tilt.parquet --figure tilt.png
+#
+# An experiment is a function experiment(rng, **params) returning a table, i.e. a dict of
+# equally long 1-d columns (scalars count as length one). The rows of all sweep points are
+# stacked, with one column per swept or overridden parameter in front.
+
+
+def bretzel(rng, n_days=10000, max_produced=24, price_per_bretzel=1.5, production_cost=1.0, leftover_price=0.75):
+    from .bretzel import expected_profit, pmf_bretzels_per_day, simulate_days
+    produced = np.arange(1, max_produced + 1)
+    profits = simulate_days(produced, n_days, rng, price_per_bretzel=price_per_bretzel,
+                            production_cost=production_cost, leftover_price=leftover_price)
+    demand_pmf = pmf_bretzels_per_day()
+    return {
+        "produced": produced,
+        "mean_profit": profits.mean(axis=1),
+        "variance": profits.var(axis=1, ddof=1) / n_days,
+        "expected_profit": [expected_profit(q, demand_pmf, price_per_bretzel, production_cost, leftover_price) for q in produced],
+    }
+
+
+def pareto_mean(rng, n=10**6, alpha=2.0, sigma=2.0, num_checkpoints=1000):
+    from .pareto import checkpoint_indices, draw_pareto_chunks, streaming_mean_process
+    checkpoints = checkpoint_indices(n, num_checkpoints)
+    _, _, _, means = streaming_mean_process(draw_pareto_chunks(n, alpha, sigma, rng=rng), checkpoints)
+    return {"samples": checkpoints, "running_mean": means}
+
+
+def _pmf_table(sampler, log_pmf, sample_size, rng):
+    samples = sampler.sample(sample_size, rng)
+    k = np.arange(samples.max() + 1)
+    return {"k": k, "frequency": np.bincount(samples, minlength=k.size) / sample_size, "pmf": np.exp(log_pmf(k))}
+
+
+def binomial(rng, sample_size=10000, n=100, p=0.6):
+    from .discrete import DiscreteInverseSampler, binomial_log_pmf
+    return _pmf_table(DiscreteInverseSampler.binomial(n, p), lambda k: binomial_log_pmf(n, p, k), sample_size, rng)
+
+
+def negative_binomial(rng, sample_size=10000, r=5, p=0.7):
+    from .discrete import DiscreteInverseSampler, negative_binomial_log_pmf
+    return _pmf_table(DiscreteInverseSampler.negative_binomial(r, p), lambda k: negative_binomial_log_pmf(r, p, k), sample_size, rng)
+
+
+def poisson(rng, sample_size=10000, lam=5.0):
+    from .discrete import poisson_log_pmf
+    from .poisson import poisson as draw_poisson
+    samples = draw_poisson(lam, sample_size, rng)
+    k = np.arange(samples.max() + 1)
+    return {"k": k, "frequency": np.bincount(samples, minlength=k.size) / sample_size, "pmf": np.exp(poisson_log_pmf(lam, k))}
+
+
+def is_tilt(rng, num_samples=10000, t=1.0):
+    from .tilted import importance_sampling_weights
+    start = time.perf_counter()
+    weights = importance_sampling_weights(num_samples, t, rng=rng)
+    seconds = time.perf_counter() - start
+    return {"estimate": np.mean(weights), "variance": np.var(weights, ddof=1) / num_samples, "seconds": seconds}
+
+
+def volume(rng, d=3, m=100, method="mc"):
+    from . import volume as volume_module
+    from .qmc import qmc_volume
+    estimators = {
+        "mc": lambda: volume_module.monte_carlo_volume(d, m, rng=rng),
+        "antithetic": lambda: volume_module.anithetic_variates_volume(d, m, rng=rng),
+        "riemann": lambda: volume_module.riemann_volume_vectorized(d, m),
+        "rqmc": lambda: qmc_volume(d, m, seed=int(rng.integers(2**31))),
+    }
+    estimate, seconds = estimators[method]()
+    return {"estimate": estimate, "exact": volume_module.exact_volume(d), "seconds": seconds}
+
+
+def lcg_period(rng, a=133, c=7, m=432, x0=0):
+    from .lcg import LCG
+    # after m steps the orbit is on its cycle, the period is the distance to the next visit
+    generator = LCG(x0, a, c, m).jump(m)
+    state = generator.state
+    period = int(np.flatnonzero(generator.random_raw(m) == state)[0]) + 1
+    return {"period": period, "full_period": period == m, "hull_dobell": LCG(x0, a, c, m).has_full_period()}
+
+
+def middle_square(rng):
+    from .middle_square import middle_square_cycles
+    mu, lam = middle_square_cycles(np.arange(10000))
+    cycle_length, index, seeds = np.unique(lam, return_inverse=True, return_counts=True)
+    return {"cycle_length": cycle_length, "seeds": seeds,
+            "mean_tail_length": np.bincount(index.ravel(), weights=mu) / seeds}
+
+
+def ellipsoid(rng, n=10000, a=0.25, b=1.0, c=4.0, r=1.0):
+    from .ellipsoid import block_acceptance_rejection
+    weights = np.array([a, b, c])
+    _, probability = block_acceptance_rejection(weights, r, n, rng)
+    box_volume = np.prod(2 * np.sqrt(r / weights))
+    return {"acceptance_rate": probability, "rejected": round(n / probability) - n, "volume": probability * box_volume,
+            "exact_volume": 4 / 3 * np.pi * np.prod(np.sqrt(r / weights))}
+
+
+def alias(rng, sample_size=10000, n=100, p=0.6):
+    from .alias import AliasTable
+    from .discrete import binomial_log_pmf
+    P = np.exp(binomial_log_pmf(n, p, np.arange(n + 1)))
+    return _pmf_table(AliasTable.from_probabilities(P), lambda k: binomial_log_pmf(n, p, k), sample_size, rng)
+
+
+def mvn(rng, N=10000, n=200, rho_1=0.8, rho_2=0.7, rho_3=0.3, method="cholesky"):
+    from .mvn import BlockEquicorrelationSampler, MVNSampler
+    factor_sampler = BlockEquicorrelationSampler(np.zeros(n), [n // 2, n - n // 2], [rho_1, rho_2], rho_3)
+    Sigma = factor_sampler.covariance()
+    samplers = {"cholesky": lambda: MVNSampler(np.zeros(n), Sigma), "factor": lambda: factor_sampler}
+    if method not in samplers:
+        raise ValueError(f"Unknown method '{method}', use one of {sorted(samplers)}.")
+    sampler = samplers[method]()
+    start = time.perf_counter()
+    X = sampler.sample(N, rng)
+    seconds = time.perf_counter() - start
+    error = np.abs(np.cov(X, rowvar=False) - Sigma)
+    return {"max_covariance_error": error.max(), "mean_covariance_error": error.mean(), "seconds": seconds}
+
+
+def ecdf(rng, n=10000, z_n=5, lam=1.0, num_points=200, y_max=30.0):
+    from .cdf import EmpiricalCDF, draw_exponential_distribution
+    # mixture Y = z X with X ~ Exp(lam) and z uniform on 1, ..., z_n
+    z = np.arange(1, z_n + 1)
+    samples = [scale * draw_exponential_distribution(lam, n // z_n, rng) for scale in z]
+    y = np.linspace(0, y_max, num_points)
+    return {"y": y, "empirical_cdf": EmpiricalCDF(samples)(y), "cdf": np.mean(-np.expm1(-lam * y[:, None] / z), axis=1)}
+
+
+def is_comparison(rng, num_samples=10000):
+    from .importance import classical_monte_carlo_weights, importance_sampling_weights
+    methods = {
+        "classical": lambda: classical_monte_carlo_weights(num_samples, rng),
+        "importance_task_2": lambda: importance_sampling_weights(num_samples, 2, rng),
+        "importance_task_3": lambda: importance_sampling_weights(num_samples, 3, rng),
+    }
+    weights = [weight() for weight in methods.values()]
+    return {"method": list(methods), "estimate": [np.mean(w) for w in weights],
+            "variance": [np.var(w, ddof=1) / num_samples for w in weights]}
+
+
+def _plot_curves(x, y, xlabel, ylabel, log_x=False, reference=None):
+    def plot(ax, table, swept):
+        for label, rows in _group_rows(table, swept):
+            ax.plot(table[x][rows], table[y][rows], label=label or None)
+            if reference is not None:
+                ax.plot(table[x][rows], table[reference][rows], linestyle="--", color="black", linewidth=0.8)
+        if log_x:
+            ax.set_xscale("log")
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+    return plot
+
+
+def _plot_pmf(ax, table, swept):
+    for label, rows in _group_rows(table, swept):
+        ax.bar(table["k"][rows], table["frequency"][rows], alpha=0.5, label=label or None)
+        ax.plot(table["k"][rows], table["pmf"][rows], marker="o", markersize=3, color="black")
+    ax.set_xlabel("k")
+    ax.set_ylabel("Probability")
+
+
+def _plot_sweep(y, ylabel):
+    def plot(ax, table, swept):
+        if not swept:
+            raise ValueError("This experiment is plotted against a swept parameter, use --grid.")
+        x = swept[0]
+        for label, rows in _group_rows(table, swept[1:]):
+            ax.plot(table[x][rows], table[y][rows], marker="o", label=label or None)
+        ax.set_xlabel(x)
+        ax.set_ylabel(ylabel)
+    return plot
+
+
+def _plot_by_method(y, ylabel):
+    def plot(ax, table, swept):
+        if not swept:
+            raise ValueError("This experiment is plotted against a swept parameter, use --grid.")
+        x = swept[0]
+        for label, rows in _group_rows(table, ["method"] + swept[1:]):
+            ax.plot(table[x][rows], table[y][rows], marker="o", label=label)
+        ax.set_xlabel(x)
+        ax.set_ylabel(ylabel)
+        ax.set_yscale("log")
+    return plot
+
+
+def _group_rows(table, keys):
+    """(label, row indices) for every combination of values of the columns keys."""
+    if not keys:
+        return [("", np.arange(len(table["point"])))]
+    groups = {}
+    for i, values in enumerate(zip(*(table[key] for key in keys))):
+        groups.setdefault(values, []).append(i)
+    return [(", ".join(f"{key}={value}" for key, value in zip(keys, values)), np.array(rows)) for values, rows in groups.items()]
+
+
+# name -> (experiment, plot(ax, table, swept parameter names) or None)
+EXPERIMENTS = {
+    "bretzel": (bretzel, _plot_curves("produced", "mean_profit", "Number of bretzels produced", "Average profit", reference="expected_profit")),
+    "pareto_mean": (pareto_mean, _plot_curves("samples", "running_mean", "Number of samples", "Running mean", log_x=True)),
+    "binomial": (binomial, _plot_pmf),
+    "negative_binomial": (negative_binomial, _plot_pmf),
+    "poisson": (poisson, _plot_pmf),
+    "is_tilt": (is_tilt, _plot_sweep("variance", "Variance of the IS estimate")),
+    "volume": (volume, _plot_sweep("estimate", "Volume estimate")),
+    "lcg_period": (lcg_period, _plot_sweep("period", "Period")),
+    "middle_square": (middle_square, _plot_curves("cycle_length", "seeds", "Cycle length", "Number of seeds")),
+    "ellipsoid": (ellipsoid, _plot_sweep("volume", "Volume estimate")),
+    "alias": (alias, _plot_pmf),
+    "mvn": (mvn, _plot_sweep("max_covariance_error", "Largest covariance error")),
+    "ecdf": (ecdf, _plot_curves("y", "empirical_cdf", "y", "F_Y(y)", reference="cdf")),
+    "is_comparison": (is_comparison, _plot_by_method("variance", "Variance of the estimate")),
+}
+
+
+def parse_value(text):
+    """Python literal if text is one (int, float, bool, ...), the plain string otherwise."""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_grid(text):
+    """
+    Values of one swept parameter: 'a:b:num' is np.linspace(a, b, num) (integers if a and b
+    are integers and the spacing is integral), anything else a comma separated list.
+    """
+    parts = text.split(":")
+    if len(parts) == 3:
+        start, stop, num = (parse_value(part) for part in parts)
+        values = np.linspace(start, stop, num)
+        if isinstance(start, int) and isinstance(stop, int) and np.all(values == np.round(values)):
+            return [int(value) for value in values]
+        return [float(value) for value in values]
+    return [parse_value(part) for part in text.split(",")]
+
+
+def _assignments(items):
+    assignments = {}
+    for item in items or []:
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"Expected name=value, got '{item}'.")
+        assignments[key] = value
+    return assignments
+
+
+def _run_point(name, params, seed_sequence, bit_generator, cache_directory=None, cache_bytes=2**30):
+    experiment, _ = EXPERIMENTS[name]
+    if cache_directory is None:
+        table = experiment(make_rng(seed_sequence, bit_generator), **params)
+    else:
+        table = ResultCache(cache_directory, cache_bytes).get_or_compute(experiment, params, seed_sequence, bit_generator)
+    columns = {key: np.atleast_1d(np.asarray(value)) for key, value in table.items()}
+    lengths = {column.size for column in columns.values()}
+    if len(lengths) != 1:
+        raise ValueError(f"Experiment '{name}' returned columns of different lengths {sorted(lengths)}.")
+    return columns
+
+
+def run_sweep(name, overrides=None, grid=None, seed=0, bit_generator="pcg64", n_workers=1, cache_directory=None, cache_bytes=2**30):
+    """
+    Run an experiment at every point of the grid (the Cartesian product of the swept values).
+
+    Every point gets its own Generator from SeedSequence(seed).spawn, so the table does not
+    depend on n_workers.
+
+    Parameters:
+    name (str): Key of EXPERIMENTS.
+    overrides (dict): Fixed parameters replacing the defaults of the experiment.
+    grid (dict): Parameter -> list of values to sweep.
+    seed (int): Root seed.
+    bit_generator (str): Key of stochsim.rng.BIT_GENERATORS.
+    n_workers (int): Number of processes for the sweep points, None for all cores.
+    cache_directory (str): If given, the table of every point is looked up in and stored to a
+        ResultCache there, keyed by experiment, parameters and seed.
+    cache_bytes (int): Size cap of the cache.
+
+    Returns:
+    dict: column -> np.ndarray with a 'point' index column, one column per parameter of
+    overrides and grid, followed by the columns of the experiment.
+    """
+    if name not in EXPERIMENTS:
+        raise ValueError(f"Unknown experiment '{name}'. Use one of {sorted(EXPERIMENTS)}.")
+    overrides = overrides or {}
+    grid = grid or {}
+    points = [dict(overrides, **dict(zip(grid, values))) for values in itertools.product(*grid.values())]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(points))
+    arguments = ([name] * len(points), points, seed_sequences, [bit_generator] * len(points),
+                 [cache_directory] * len(points), [cache_bytes] * len(points))
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if n_workers == 1 or len(points) == 1:
+        tables = list(map(_run_point, *arguments))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(points))) as executor:
+            tables = list(executor.map(_run_point, *arguments))
+
+    rows = [len(next(iter(table.values()))) for table in tables]
+    result = {"point": np.repeat(np.arange(len(points)), rows)}
+    for key in points[0]:
+        result[key] = np.repeat(np.array([point[key] for point in points]), rows)
+    for key in tables[0]:
+        result[key] = np.concatenate([table[key] for table in tables])
+    return result
+
+
+def write_table(table, path):
+    """Write a table as .csv, .npz or .parquet (needs pandas with pyarrow or fastparquet)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npz":
+        np.savez(path, **table)
+    elif extension == ".parquet":
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("Writing parquet needs pandas (and pyarrow or fastparquet).") from None
+        pd.DataFrame(table).to_parquet(path, index=False)
+    elif extension == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(table)
+            writer.writerows(zip(*(column.tolist() for column in table.values())))
+    else:
+        raise ValueError(f"Unknown output format '{extension}', use .csv, .npz or .parquet.")
+
+
+def save_figure(name, table, swept, path):
+    """Plot a table with the plot function of the experiment and save it to path (no window)."""
+    _, plot = EXPERIMENTS[name]
+    if plot is None:
+        raise ValueError(f"Experiment '{name}' has no figure.")
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    plot(ax, table, swept)
+    if ax.get_legend_handles_labels()[0]:
+        ax.legend()
+    ax.set_title(name)
+    ax.grid()
+    fig.savefig(path, bbox_inches="tight")
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an experiment of the exercise sheets headless.")
+    parser.add_argument("name", help=f"experiment, one of {', '.join(EXPERIMENTS)}")
+    parser.add_argument("--set", dest="overrides", action="append", metavar="NAME=VALUE", help="override a parameter")
+    parser.add_argument("--grid", action="append", metavar="NAME=VALUES", help="sweep a parameter over 'a,b,c' or linspace 'start:stop:num'")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bit-generator", default="pcg64")
+    parser.add_argument("--workers", type=int, default=1, help="processes for the sweep points (0: all cores)")
+    parser.add_argument("--output", help="write the table to a .csv, .npz or .parquet file")
+    parser.add_argument("--figure", help="save a figure of the table to this file")
+    parser.add_argument("--cache", metavar="DIRECTORY", help="reuse the tables of earlier runs stored in this directory")
+    parser.add_argument("--cache-size", type=float, default=1.0, help="size cap of the cache in GiB")
+    parser.add_argument("--profile", metavar="FILE", help="write the sampler counters as JSON (runs the sweep in-process)")
+    args = parser.parse_args(argv)
+
+    overrides = {key: parse_value(value) for key, value in _assignments(args.overrides).items()}
+    grid = {key: parse_grid(value) for key, value in _assignments(args.grid).items()}
+    start = time.perf_counter()
+    with profiling() if args.profile else contextlib.nullcontext() as profile:
+        # counters are collected in this process, so a profiled sweep does not use workers
+        table = run_sweep(args.name, overrides, grid, args.seed, args.bit_generator, 1 if args.profile else args.workers or None,
+                          args.cache, int(args.cache_size * 2**30))
+    if args.profile:
+        profile.save(args.profile)
+    n_points = table["point"][-1] + 1
+    # stdout may carry the CSV table, so the summary goes to stderr
+    print(f"{args.name}: {n_points} point(s), {len(table['point'])} rows in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    if args.output:
+        write_table(table, args.output)
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(table)
+        writer.writerows(zip(*(column.tolist() for column in table.values())))
+    if args.figure:
+        save_figure(args.name, table, list(grid), args.figure)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import functools
+import numpy as np
+
+from .parallel import map_blocks
+
+
+## Mergeable count histograms of integer samples and goodness-of-fit against a known PMF
+
+
+class CountHistogram:
+    """
+    Counts of the values 0, 1, ..., max_value of an integer sampler, updated chunk by chunk
+    with np.bincount, so memory does not depend on the number of samples. Values above
+    max_value (or below 0) are only counted in overflow. Histograms of disjoint sample
+    streams, e.g. from different processes, are combined with merge or +.
+
+    Parameters:
+    max_value (int): Largest value with its own bin, None to grow the bins with the data.
+    """
+
+    def __init__(self, max_value=None):
+        self.max_value = max_value
+        self.counts = np.zeros(0 if max_value is None else max_value + 1, dtype=np.int64)
+        self.overflow = 0
+
+    @property
+    def total(self):
+        return int(self.counts.sum()) + self.overflow
+
+    def update(self, samples):
+        samples = np.asarray(samples, dtype=np.int64).ravel()
+        if self.max_value is not None:
+            inside = (samples >= 0) & (samples <= self.max_value)
+            self.overflow += samples.size - int(np.count_nonzero(inside))
+            samples = samples[inside]
+        elif samples.size and samples.min() < 0:
+            raise ValueError("Negative values need a histogram with max_value (they are counted as overflow).")
+        if not samples.size:
+            return self
+        counts = np.bincount(samples, minlength=self.counts.size)
+        counts[:self.counts.size] += self.counts
+        self.counts = counts
+        return self
+
+    def merge(self, other):
+        if self.max_value != other.max_value:
+            raise ValueError("Only histograms with the same max_value can be merged.")
+        size = max(self.counts.size, other.counts.size)
+        counts = np.zeros(size, dtype=np.int64)
+        counts[:self.counts.size] += self.counts
+        counts[:other.counts.size] += other.counts
+        merged = CountHistogram(self.max_value)
+        merged.counts = counts
+        merged.overflow = self.overflow + other.overflow
+        return merged
+
+    __add__ = merge
+
+    def pmf(self):
+        """Relative frequencies of 0, ..., len(counts) - 1."""
+        return self.counts / max(self.total, 1)
+
+
+def _pooled_bins(observed, expected, min_expected):
+    # merge neighbouring bins from the left until every group expects at least min_expected
+    # counts, a remainder below min_expected is added to the last group
+    groups_observed, groups_expected = [], []
+    current_observed = current_expected = 0.0
+    for o, e in zip(observed, expected):
+        current_observed += o
+        current_expected += e
+        if current_expected >= min_expected:
+            groups_observed.append(current_observed)
+            groups_expected.append(current_expected)
+            current_observed = current_expected = 0.0
+    if groups_expected:
+        groups_observed[-1] += current_observed
+        groups_expected[-1] += current_expected
+    else:
+        groups_observed, groups_expected = [current_observed], [current_expected]
+    return np.array(groups_observed), np.array(groups_expected)
+
+
+def goodness_of_fit(histogram, log_pmf, min_expected=5.0, tail_mass=1e-12):
+    """
+    Compare a histogram with a known PMF on {0, 1, 2, ...}.
+
+    The PMF is evaluated on 0, ..., K where K covers the observed values and all but tail_mass
+    of the probability. The remaining probability mass and the overflow count form one tail bin.
+
+    Parameters:
+    histogram (CountHistogram): Observed counts.
+    log_pmf (callable): Vectorized log P(X=k), e.g. lambda k: binomial_log_pmf(n, p, k).
+    min_expected (int): Minimum expected count per bin of the chi-square test (bins are pooled).
+
+    Returns:
+    dict: n, chi_square, dof, p_value (chi-square test), ks (sup |F_n - F|), ks_scaled
+    (sqrt(n) * ks, conservative for discrete laws: P(ks_scaled > 1.36) <= 0.05) and
+    total_variation (1/2 sum |p_n - p|).
+    """
+    from scipy.stats import chi2
+
+    n = histogram.total
+    if n == 0:
+        raise ValueError("The histogram is empty.")
+    size = max(histogram.counts.size, 1)
+    pmf = np.exp(log_pmf(np.arange(size)))
+    while histogram.max_value is None and 1 - pmf.sum() > tail_mass and size < 2**26:
+        size *= 2
+        pmf = np.exp(log_pmf(np.arange(size)))
+    if histogram.max_value is not None:
+        pmf = pmf[:histogram.max_value + 1]
+    observed = np.zeros(pmf.size, dtype=float)
+    observed[:histogram.counts.size] = histogram.counts[:pmf.size]
+    tail_probability = max(1 - pmf.sum(), 0.0)
+    observed_tail = histogram.overflow + histogram.counts[pmf.size:].sum()
+
+    empirical_cdf = np.cumsum(observed) / n
+    cdf = np.cumsum(pmf)
+    ks = float(np.max(np.abs(empirical_cdf - cdf)))
+    total_variation = 0.5 * (np.sum(np.abs(observed / n - pmf)) + abs(observed_tail / n - tail_probability))
+
+    groups_observed, groups_expected = _pooled_bins(
+        np.append(observed, observed_tail), n * np.append(pmf, tail_probability), min_expected)
+    statistic = float(np.sum((groups_observed - groups_expected) ** 2 / groups_expected))
+    dof = groups_expected.size - 1
+    return {
+        "n": n,
+        "chi_square": statistic,
+        "dof": dof,
+        "p_value": float(chi2.sf(statistic, dof)) if dof > 0 else float("nan"),
+        "ks": ks,
+        "ks_scaled": float(ks * np.sqrt(n)),
+        "total_variation": float(total_variation),
+    }
+
+
+def _histogram_block(sampler, chunk_size, max_value, count, rng):
+    histogram = CountHistogram(max_value)
+    for start in range(0, count, chunk_size):
+        histogram.update(sampler(min(chunk_size, count - start), rng=rng))
+    return histogram
+
+
+def parallel_histogram(sampler, n_samples, seed=0, block_size=10**7, chunk_size=2**20, max_value=None, n_workers=None,
+                       bit_generator="pcg64"):
+    """
+    Histogram of n_samples draws of sampler(n, rng=rng), produced in blocks on a process pool
+    by stochsim.parallel.map_blocks (one SeedSequence child per block, so the counts do not
+    depend on n_workers) and merged. Each block draws chunk_size samples at a time, so 10^9
+    draws need no more memory than one chunk per worker.
+    """
+    histograms = map_blocks(functools.partial(_histogram_block, sampler, chunk_size, max_value), n_samples, block_size,
+                            seed, n_workers, bit_generator)
+    histogram = histograms[0]
+    for other in histograms[1:]:
+        histogram = histogram.merge(other)
+    return histogram
@@ -0,0 +1,56 @@
+import numpy as np
+
+from .instrument import instrumented, record
+from .rng import get_rng
+
+
+## Estimators of theta = int_0^1 exp(x^2) dx = E(g(x)), where g(x) = exp(x^2) and x ~ U(0,1)
+
+def g(x):
+    return np.exp(x**2)
+
+def f_tilde(x, task=2):
+    if task == 2:
+        return 2 * x
+    elif task == 3:
+        return np.exp(x)/(np.exp(1)-1)
+    else:
+        raise ValueError("Invalid task number. Use 2 or 3.")
+    
+def F_tilde_inv(u, task=2):
+    if task == 2:
+        return np.sqrt(u)
+    elif task == 3:
+        return np.log(u * (np.exp(1)-1) + 1)
+    else:
+        raise ValueError("Invalid task number. Use 2 or 3.")
+    
+@instrumented("importance.importance_sampling_weights")
+def importance_sampling_weights(num_samples, task=2, rng=None):
+    record("importance.importance_sampling_weights", uniforms=num_samples)
+    u_samples = get_rng(rng).uniform(0, 1, num_samples)
+    x_samples = F_tilde_inv(u_samples, task=task)
+    return g(x_samples) / f_tilde(x_samples, task=task)
+
+def importance_sampling(num_samples=10000, task=2, rng=None):
+    weights = importance_sampling_weights(num_samples, task=task, rng=rng)
+    theta_estimate = np.mean(weights)
+
+    # Variance
+    variance = np.var(weights) / num_samples
+
+    # Running mean
+    running_mean = np.cumsum(weights) / np.arange(1, num_samples + 1)
+    return theta_estimate, variance, running_mean
+
+@instrumented()
+def classical_monte_carlo_weights(num_samples, rng=None):
+    record("classical_monte_carlo_weights", uniforms=num_samples)
+    return g(get_rng(rng).uniform(0, 1, num_samples))
+
+def classical_monte_carlo(num_samples=10000, rng=None):
+    g_values = classical_monte_carlo_weights(num_samples, rng=rng)
+    theta_estimate = np.mean(g_values)
+    variance = np.var(g_values) / num_samples
+    running_mean = np.cumsum(g_values) / np.arange(1, num_samples + 1)
+    return theta_estimate, variance, running_mean
@@ -0,0 +1,187 @@
+import contextlib
+import functools
+import json
+import time
+import tracemalloc
+import numpy as np
+
+
+## Opt-in instrumentation of the samplers
+#
+#   with profiling() as profile:
+#       poisson(100.0, 10**6)
+#   profile.save("profile.json")
+#
+# Samplers are wrapped with @instrumented (calls, variates, wall time, output bytes) and
+# report their loop counters with record(...). Both only look at the module-level _profile
+# when profiling is off, so the overhead is one global lookup per call.
+
+_profile = None
+
+COUNTERS = ("calls", "variates", "uniforms", "iterations", "proposals", "accepted", "seconds", "output_bytes", "peak_bytes")
+
+
+class Profile:
+    """
+    Counters per sampler name: calls, variates returned, random draws consumed ("uniforms",
+    exponential and normal draws count as one each), loop iterations, proposals and accepted
+    proposals of rejection samplers, wall time, bytes of the returned arrays, the peak of
+    traced allocations (only with trace_memory) and time per named stage.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stats = {}
+        self._frames = []  # running allocation peaks of the enclosing instrumented calls
+
+    def _entry(self, name):
+        if name not in self.stats:
+            self.stats[name] = dict.fromkeys(COUNTERS, 0)
+            self.stats[name]["stages"] = {}
+        return self.stats[name]
+
+    def add(self, name, **counts):
+        entry = self._entry(name)
+        for key, value in counts.items():
+            if key == "peak_bytes":
+                entry[key] = max(entry[key], int(value))
+            else:
+                entry[key] += value
+
+    def add_stage(self, name, stage, seconds):
+        stages = self._entry(name)["stages"]
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def summary(self):
+        """Counters plus the derived cost per variate and acceptance rate of every sampler."""
+        rows = {}
+        for name, entry in self.stats.items():
+            row = dict(entry, stages=dict(entry["stages"]))
+            variates = entry["variates"]
+            row["uniforms_per_variate"] = entry["uniforms"] / variates if variates else None
+            row["iterations_per_variate"] = entry["iterations"] / variates if variates else None
+            row["seconds_per_variate"] = entry["seconds"] / variates if variates else None
+            row["acceptance_rate"] = entry["accepted"] / entry["proposals"] if entry["proposals"] else None
+            rows[name] = row
+        return rows
+
+    def to_json(self):
+        return json.dumps({"trace_memory": self.trace_memory, "samplers": self.summary()}, indent=2, default=float)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            f.write(self.to_json())
+
+    def report(self):
+        lines = [f"{'sampler':46s} {'calls':>8s} {'variates':>12s} {'uniforms/var':>12s} {'iter/var':>10s} {'accept':>7s} {'ns/var':>10s}"]
+        for name, row in self.summary().items():
+            def show(value, format):
+                return format.format(value) if value is not None else "-"
+            lines.append(f"{name:46s} {row['calls']:8d} {row['variates']:12d} {show(row['uniforms_per_variate'], '{:12.3f}'):>12s} "
+                         f"{show(row['iterations_per_variate'], '{:10.3f}'):>10s} {show(row['acceptance_rate'], '{:7.3f}'):>7s} "
+                         f"{show(row['seconds_per_variate'] and row['seconds_per_variate'] * 1e9, '{:10.1f}'):>10s}")
+        return "\n".join(lines)
+
+
+def active():
+    """The Profile being recorded, None if profiling is off."""
+    return _profile
+
+
+@contextlib.contextmanager
+def profiling(trace_memory=False):
+    """
+    Record every instrumented sampler call in the block into a new Profile. With trace_memory
+    the peak of Python/numpy allocations per call is traced as well (tracemalloc, slow).
+    """
+    global _profile
+    previous = _profile
+    profile = Profile(trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    _profile = profile
+    try:
+        yield profile
+    finally:
+        _profile = previous
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def record(name, **counts):
+    """Add counters (uniforms=..., iterations=..., ...) to sampler name if profiling is on."""
+    if _profile is not None:
+        _profile.add(name, **counts)
+
+
+class _Stage:
+    def __init__(self, profile, name, stage):
+        self.profile, self.name, self.stage = profile, name, stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.profile.add_stage(self.name, self.stage, time.perf_counter() - self.start)
+
+
+_NO_STAGE = contextlib.nullcontext()
+
+
+def stage(name, stage_name):
+    """Context manager timing one stage (e.g. table setup) of sampler name, a no-op if profiling is off."""
+    if _profile is None:
+        return _NO_STAGE
+    return _Stage(_profile, name, stage_name)
+
+
+def _output_size(result):
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, np.ndarray):
+        return result.size, result.nbytes
+    return (0, 0) if result is None else (1, 0)
+
+
+def instrumented(name=None, variates=None):
+    """
+    Decorator recording calls, wall time, variates and output bytes of a sampler.
+
+    Parameters:
+    name (str): Key in the profile, defaults to the qualified function name.
+    variates (callable): variates(result) -> number of variates returned, defaults to the size
+        of the returned array (of the first element of a returned tuple).
+    """
+    def decorator(function):
+        key = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profile = _profile
+            if profile is None:
+                return function(*args, **kwargs)
+
+            if profile.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                for frame in profile._frames:
+                    frame[1] = max(frame[1], peak)
+                tracemalloc.reset_peak()
+                profile._frames.append([current, 0])
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                if profile.trace_memory:
+                    start_bytes, inner_peak = profile._frames.pop()
+                    peak = max(inner_peak, tracemalloc.get_traced_memory()[1])
+                    for frame in profile._frames:
+                        frame[1] = max(frame[1], peak)
+                    profile.add(key, peak_bytes=peak - start_bytes)
+            size, nbytes = _output_size(result)
+            profile.add(key, calls=1, seconds=seconds, output_bytes=nbytes,
+                        variates=variates(result) if variates is not None else size)
+            return result
+        return wrapper
+    return decorator
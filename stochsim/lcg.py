@@ -0,0 +1,246 @@
+import math
+import numpy as np
+
+from .instrument import instrumented, record
+
+
+def lcg_random(x0, a, c, m):
+    return (a * x0 + c) % m
+
+
+def _is_prime(n):
+    # deterministic Miller-Rabin, the bases are enough for n < 3.3 * 10^24
+    if n < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    if n in bases:
+        return True
+    if any(n % p == 0 for p in bases):
+        return False
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _pollard_rho(n):
+    # a nontrivial factor of the odd composite n (Brent's variant of Pollard's rho)
+    for c in range(1, n):
+        y, m, g, r, q = 2, 128, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    raise ArithmeticError(f"No factor of {n} found.")
+
+
+def _prime_factors(n):
+    # small factors by trial division, the rest with Miller-Rabin and Pollard's rho
+    factors = set()
+    for d in range(2, 1000):
+        while n % d == 0:
+            factors.add(d)
+            n //= d
+    pending = [n] if n > 1 else []
+    while pending:
+        n = pending.pop()
+        if _is_prime(n):
+            factors.add(n)
+        else:
+            d = _pollard_rho(n)
+            pending += [d, n // d]
+    return factors
+
+
+class LCG:
+    """
+    Linear congruential generator x_{n+1} = (a * x_n + c) mod m producing whole arrays.
+
+    Blocks are generated from the affine closed form x_{n+k} = a^k x_n + c (a^{k-1} + ... + 1) mod m
+    with precomputed coefficients. For m <= 2^32 the arithmetic runs in uint64 without overflow,
+    for larger moduli it falls back to Python integers (object arrays), so results are always exact.
+
+    The interface mirrors the parts of np.random.Generator / BitGenerator used in this repo
+    (random_raw, random, uniform, integers, exponential, standard_normal, normal, permutation,
+    choice, all with int or tuple sizes), so the LCG can be passed as rng to the samplers.
+    Every variate is built from the uniforms x_n / m, so the resolution is 1 / m.
+    """
+
+    def __init__(self, seed, a, c, m, block_size=4096):
+        self.a = a % m
+        self.c = c % m
+        self.m = m
+        self.state = seed % m
+        self.block_size = block_size
+        self._cast = np.uint64 if m <= 2**32 else int
+        self._coefficients = None
+
+    def _affine_power(self, n):
+        # (a, c)^n under composition of x -> a x + c, by repeated squaring
+        a_n, c_n = 1, 0
+        a_sq, c_sq = self.a, self.c
+        while n > 0:
+            if n & 1:
+                a_n, c_n = (a_sq * a_n) % self.m, (a_sq * c_n + c_sq) % self.m
+            a_sq, c_sq = (a_sq * a_sq) % self.m, (a_sq * c_sq + c_sq) % self.m
+            n >>= 1
+        return a_n, c_n
+
+    def _block_coefficients(self):
+        # a^k and c (a^{k-1} + ... + 1) mod m for k = 1, ..., block_size
+        if self._coefficients is None:
+            a_k = np.empty(self.block_size, dtype=object)
+            c_k = np.empty(self.block_size, dtype=object)
+            a_prev, c_prev = 1, 0
+            for k in range(self.block_size):
+                a_prev, c_prev = (self.a * a_prev) % self.m, (self.a * c_prev + self.c) % self.m
+                a_k[k], c_k[k] = a_prev, c_prev
+            dtype = np.uint64 if self._cast is np.uint64 else object
+            self._coefficients = (a_k.astype(dtype), c_k.astype(dtype))
+        return self._coefficients
+
+    def jump(self, n):
+        """
+        Advance the state by n steps in O(log n).
+        """
+        a_n, c_n = self._affine_power(n)
+        self.state = (a_n * self.state + c_n) % self.m
+        return self
+
+    def spawn(self, n_streams, stride):
+        """
+        Split into n_streams generators whose states are stride steps apart.
+        """
+        streams = []
+        for i in range(n_streams):
+            stream = LCG(self.state, self.a, self.c, self.m, self.block_size)
+            streams.append(stream.jump(i * stride))
+        return streams
+
+    def has_full_period(self):
+        """
+        Hull-Dobell theorem: the period equals m iff gcd(c, m) = 1, a - 1 is divisible by every
+        prime factor of m, and a - 1 is divisible by 4 if m is.
+        """
+        if math.gcd(self.c, self.m) != 1:
+            return False
+        if any((self.a - 1) % q != 0 for q in _prime_factors(self.m)):
+            return False
+        return self.m % 4 != 0 or (self.a - 1) % 4 == 0
+
+    @instrumented()
+    def random_raw(self, size=None):
+        """
+        Next size raw states as an integer array (a single int if size is None).
+        """
+        if size is None:
+            return int(self.random_raw(1)[0])
+        shape = (size,) if np.ndim(size) == 0 else tuple(size)
+        size = math.prod(shape)
+        a_k, c_k = self._block_coefficients()
+        m = self._cast(self.m)
+        out = np.empty(size, dtype=a_k.dtype)
+        record("LCG.random_raw", iterations=-(-size // self.block_size))
+        for start in range(0, size, self.block_size):
+            block = min(self.block_size, size - start)
+            state = self._cast(self.state)
+            out[start:start + block] = (a_k[:block] * state + c_k[:block]) % m
+            self.state = int(out[start + block - 1])
+        return out.reshape(shape)
+
+    def random(self, size=None):
+        """
+        Uniforms x_n / m in [0, 1). For m > 2^53 the quotient is truncated to 53 bits,
+        floor(2^53 x_n / m) / 2^53, so it cannot round up to 1.
+        """
+        if size is None:
+            return float(self.random(1)[0])
+        raw = self.random_raw(size)
+        if self.m > 2**53:
+            return (raw * (1 << 53) // self.m).astype(float) / 2.0**53
+        return raw.astype(float) / self.m
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        return low + (high - low) * self.random(size)
+
+    def integers(self, low, high=None, size=None, dtype=np.int64, endpoint=False):
+        """
+        Integers in [low, high) ([0, low) if high is None) as floor(low + (high - low) U).
+        Ranges wider than m cannot be covered uniformly and raise a ValueError.
+        """
+        if high is None:
+            low, high = 0, low
+        if endpoint:
+            high = high + 1
+        width = np.asarray(high) - np.asarray(low)
+        if np.any(width > self.m):
+            raise ValueError("The range of integers must not exceed the modulus m of the LCG.")
+        values = np.minimum(np.floor(width * self.random(size)), width - 1) + low
+        return int(values) if size is None and np.ndim(values) == 0 else values.astype(dtype)
+
+    def exponential(self, scale=1.0, size=None):
+        """Exponential variates -scale log(1 - U) by inversion."""
+        return -scale * np.log1p(-self.random(size))
+
+    def standard_normal(self, size=None, dtype=np.float64, out=None):
+        """
+        Standard normal variates by the Box-Muller transform (two uniforms per pair of normals).
+        """
+        shape = () if size is None else ((size,) if np.ndim(size) == 0 else tuple(size))
+        if out is not None:
+            shape = out.shape
+        n = math.prod(shape)
+        u = self.random(2 * (-(-n // 2))).reshape(2, -1)
+        radius = np.sqrt(-2 * np.log1p(-u[0]))  # 1 - U in (0, 1]
+        angle = 2 * np.pi * u[1]
+        z = np.concatenate((radius * np.cos(angle), radius * np.sin(angle)))[:n].reshape(shape)
+        if out is not None:
+            out[...] = z
+            return out
+        return float(z) if size is None else z.astype(dtype)
+
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        return loc + scale * self.standard_normal(size)
+
+    def permutation(self, x):
+        """Random permutation of range(x) (int x) or a shuffled copy of an array."""
+        values = np.arange(x) if np.ndim(x) == 0 else np.asarray(x)
+        return values[np.argsort(self.random(len(values)), kind="stable")]
+
+    def choice(self, a, size=None, replace=True):
+        """Uniform choice from range(a) (int a) or the entries of a one-dimensional array."""
+        values = np.arange(a) if np.ndim(a) == 0 else np.asarray(a)
+        if replace:
+            return values[self.integers(0, len(values), size)]
+        n = 1 if size is None else math.prod((size,) if np.ndim(size) == 0 else size)
+        if n > len(values):
+            raise ValueError("Cannot take a larger sample than the population without replacement.")
+        chosen = self.permutation(values)[:n]
+        return chosen[0] if size is None else chosen.reshape(size)
@@ -0,0 +1,80 @@
+import numpy as np
+
+from .instrument import instrumented, record
+
+
+def middle_square_method(seed):
+    squared = str(seed ** 2).zfill(8)  # Square the seed and pad with zeros
+    middle_digits = squared[2:6]  # Extract the middle four digits
+    return int(middle_digits)
+
+
+def middle_square_step(seeds):
+    """
+    Integer version of middle_square_method, works elementwise on arrays.
+    The middle four digits of the 8-digit square are (x^2 // 100) mod 10^4.
+    """
+    seeds = np.asarray(seeds, dtype=np.int64)
+    return (seeds * seeds // 100) % 10000
+
+
+@instrumented()
+def middle_square_orbits(seeds, n_steps):
+    """
+    Advance all seeds at once.
+
+    Returns:
+    np.ndarray: Array of shape (n_steps + 1, len(seeds)), row i holds the i-th iterate.
+    """
+    orbits = np.empty((n_steps + 1, np.size(seeds)), dtype=np.int64)
+    orbits[0] = seeds
+    for i in range(n_steps):
+        orbits[i + 1] = middle_square_step(orbits[i])
+    record("middle_square_orbits", iterations=n_steps * np.size(seeds))
+    return orbits
+
+
+@instrumented(variates=lambda result: result[0].size)
+def middle_square_cycles(seeds):
+    """
+    Brent's cycle detection for every seed in parallel.
+
+    Parameters:
+    seeds (array_like): Starting values in 0..9999.
+
+    Returns:
+    tuple: (tail length mu, cycle length lam) per seed, i.e. x_mu is the first
+    value that is repeated and x_{mu + lam} = x_mu.
+    """
+    seeds = np.asarray(seeds, dtype=np.int64)
+
+    # find the cycle length lam
+    power = np.ones_like(seeds)
+    lam = np.ones_like(seeds)
+    tortoise = seeds.copy()
+    hare = middle_square_step(seeds)
+    active = tortoise != hare
+    while active.any():
+        restart = active & (power == lam)
+        tortoise[restart] = hare[restart]
+        power[restart] *= 2
+        lam[restart] = 0
+        hare[active] = middle_square_step(hare[active])
+        lam[active] += 1
+        active &= tortoise != hare
+
+    # find the tail length mu: hare starts lam steps ahead, both move until they meet
+    hare = seeds.copy()
+    for step in range(lam.max()):
+        ahead = step < lam
+        hare[ahead] = middle_square_step(hare[ahead])
+    tortoise = seeds.copy()
+    mu = np.zeros_like(seeds)
+    active = tortoise != hare
+    while active.any():
+        tortoise[active] = middle_square_step(tortoise[active])
+        hare[active] = middle_square_step(hare[active])
+        mu[active] += 1
+        active &= tortoise != hare
+    record("middle_square_cycles", iterations=int(np.sum(lam) + np.sum(mu)))
+    return mu, lam
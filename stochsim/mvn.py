@@ -0,0 +1,95 @@
+import numpy as np
+from functools import lru_cache
+
+from .instrument import instrumented, record
+from .rng import get_rng
+
+CHOLESKY_CACHE_SIZE = 16
+
+
+@lru_cache(maxsize=CHOLESKY_CACHE_SIZE)
+def _cholesky(Sigma_bytes, n):
+    # keyed by the raw bytes of Sigma, least recently used factors are dropped
+    C = np.linalg.cholesky(np.frombuffer(Sigma_bytes).reshape(n, n))
+    C.flags.writeable = False  # shared by all samplers of this Sigma
+    return C
+
+
+class MVNSampler:
+    """
+    Sampler for X ~ N(mu, Sigma) drawing all N samples as one matmul X = mu + Z C^T,
+    where C is the Cholesky factor of Sigma. The factors of the CHOLESKY_CACHE_SIZE most
+    recently used covariance matrices are cached.
+    """
+
+    def __init__(self, mu, Sigma):
+        Sigma = np.ascontiguousarray(Sigma, dtype=float)
+        self.C = _cholesky(Sigma.tobytes(), Sigma.shape[0])
+        self.mu = np.asarray(mu, dtype=float)
+
+    @instrumented(variates=len)
+    def sample(self, N, rng=None, dtype=np.float64, out=None):
+        """
+        Draw N samples into an (N, n) array.
+
+        Parameters:
+        N (int): Number of samples.
+        rng (np.random.Generator): Random number generator, the shared default if None.
+        dtype: np.float64 or np.float32.
+        out (np.ndarray): Optional preallocated (N, n) buffer of the given dtype.
+        """
+        rng = get_rng(rng)
+        Z = rng.standard_normal((N, self.C.shape[0]), dtype=dtype)
+        record("MVNSampler.sample", uniforms=Z.size)
+        if out is None:
+            out = np.empty_like(Z)
+        np.matmul(Z, self.C.T.astype(dtype, copy=False), out=out)
+        out += self.mu.astype(dtype, copy=False)
+        return out
+
+
+class BlockEquicorrelationSampler:
+    """
+    Fast path for unit-variance covariances with constant correlation within[b] inside
+    block b and constant correlation between across different blocks
+    (requires 0 <= between <= within[b] <= 1).
+
+    Such an X is generated from shared latent factors:
+    X_i = mu_i + sqrt(between) W + sqrt(within[b] - between) V_b + sqrt(1 - within[b]) eps_i,
+    which costs O(n) per sample instead of O(n^2) for the Cholesky product.
+    """
+
+    def __init__(self, mu, block_sizes, within, between):
+        within = np.asarray(within, dtype=float)
+        if between < 0 or np.any(within < between) or np.any(within > 1):
+            raise ValueError("Need 0 <= between <= within <= 1 for the factor representation.")
+        self.mu = np.asarray(mu, dtype=float)
+        self.block_sizes = np.asarray(block_sizes)
+        self.block_of = np.repeat(np.arange(self.block_sizes.size), self.block_sizes)
+        self.global_loading = np.sqrt(between)
+        self.block_loading = np.sqrt(within - between)[self.block_of]
+        self.noise_scale = np.sqrt(1 - within)[self.block_of]
+        self.within = within
+        self.between = between
+
+    def covariance(self):
+        same_block = self.block_of[:, None] == self.block_of[None, :]
+        Sigma = np.where(same_block, self.within[self.block_of][:, None], self.between)
+        np.fill_diagonal(Sigma, 1.0)
+        return Sigma
+
+    @instrumented(variates=len)
+    def sample(self, N, rng=None, dtype=np.float64, out=None):
+        rng = get_rng(rng)
+        n = self.block_of.size
+        record("BlockEquicorrelationSampler.sample", uniforms=N * (n + 1 + self.block_sizes.size))
+        if out is None:
+            out = np.empty((N, n), dtype=dtype)
+        rng.standard_normal((N, n), dtype=dtype, out=out)
+        out *= self.noise_scale.astype(dtype)
+        W = rng.standard_normal((N, 1), dtype=dtype)
+        V = rng.standard_normal((N, self.block_sizes.size), dtype=dtype)
+        out += self.global_loading * W
+        out += V[:, self.block_of] * self.block_loading.astype(dtype)
+        out += self.mu.astype(dtype)
+        return out
@@ -0,0 +1,89 @@
+import functools
+import os
+import numpy as np
+
+from .rng import make_rng
+
+
+def _call_block(function, seed_sequence, bit_generator, count):
+    return function(count, make_rng(seed_sequence, bit_generator))
+
+
+def map_blocks(function, n_items, block_size, seed=0, n_workers=None, bit_generator="pcg64"):
+    """
+    Run function(count, rng) on consecutive blocks of at most block_size of n_items draws,
+    on a process pool. Every block gets its own np.random.Generator on bit_generator from
+    SeedSequence(seed).spawn, so the results do not depend on n_workers.
+
+    Parameters:
+    function (callable): Picklable, e.g. a module level function or a functools.partial of one.
+    n_items (int): Total number of draws, split into blocks.
+    block_size (int): Draws per block (the unit of work sent to a worker).
+    seed (int): Root seed.
+    n_workers (int): Number of processes, defaults to the number of cores. 1 runs in-process.
+    bit_generator (str): Key of stochsim.rng.BIT_GENERATORS.
+
+    Returns:
+    list: The results of the blocks in block order.
+    """
+    if n_items < 1:
+        raise ValueError(f"The number of draws must be positive, got {n_items}.")
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    counts = [min(block_size, n_items - start) for start in range(0, n_items, block_size)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(counts))
+    arguments = ([function] * len(counts), seed_sequences, [bit_generator] * len(counts), counts)
+    if n_workers == 1:
+        return list(map(_call_block, *arguments))
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(_call_block, *arguments))
+
+
+def _block_moments(sampler, count, rng, axis):
+    values = np.moveaxis(np.asarray(sampler(count, rng=rng), dtype=float), axis, 0)
+    mean = np.mean(values, axis=0)
+    m2 = np.sum((values - mean) ** 2, axis=0)
+    return count, mean, m2
+
+
+def merge_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+    """
+    Combine (count, mean, sum of squared deviations) of two disjoint samples exactly
+    (pairwise update of Chan et al.).
+    """
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta ** 2 * count_a * count_b / count
+    return count, mean, m2
+
+
+def parallel_replications(sampler, n_replications, seed=0, block_size=10000, n_workers=None, axis=0, bit_generator="pcg64"):
+    """
+    Run n_replications of a vectorized sampler on a process pool.
+
+    The replications are cut into blocks of block_size and run by map_blocks. Block moments
+    are merged in block order, so the result is bit-reproducible for any number of workers.
+
+    Parameters:
+    sampler (callable): sampler(n, rng=rng) returns n replications along the given axis.
+        It must be picklable, e.g. a module level function or a functools.partial of one.
+    n_replications (int): Total number of replications.
+    seed (int): Root seed.
+    block_size (int): Replications per block (the unit of work sent to a worker).
+    n_workers (int): Number of processes, defaults to the number of cores. 1 runs in-process.
+    axis (int): Axis of the sampler output that indexes the replications.
+    bit_generator (str): Key of stochsim.rng.BIT_GENERATORS, e.g. "philox" or "sfc64".
+
+    Returns:
+    tuple: (mean, variance of the estimate of the mean, number of replications)
+    """
+    blocks = map_blocks(functools.partial(_block_moments, sampler, axis=axis), n_replications, block_size, seed,
+                        n_workers, bit_generator)
+
+    count, mean, m2 = blocks[0]
+    for block in blocks[1:]:
+        count, mean, m2 = merge_moments(count, mean, m2, *block)
+    variance = m2 / (count - 1) / count if count > 1 else np.full_like(m2, np.nan)
+    return mean, variance, count
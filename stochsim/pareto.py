@@ -0,0 +1,82 @@
+import numpy as np
+
+from .instrument import instrumented, record
+from .rng import get_rng
+
+
+@instrumented()
+def draw_pareto(n, alpha, sigma, rng=None):
+    record("draw_pareto", uniforms=n)
+    u = 1 - get_rng(rng).random(n)  # u in (0, 1] avoids 0 ** (-1 / alpha)
+    return sigma * (u ** (-1 / alpha) - 1)
+
+
+def mean_process(data):
+    cumsum = np.cumsum(data)
+    counts = np.arange(1, data.size + 1)
+    return cumsum / counts
+
+
+def draw_pareto_chunks(n, alpha, sigma, chunk_size=2**20, rng=None):
+    """
+    Generator yielding n Pareto samples in blocks of at most chunk_size.
+
+    Parameters:
+    n (int): Total number of samples.
+    alpha (float): Tail index.
+    sigma (float): Scale parameter.
+    chunk_size (int): Maximum number of samples held in memory at once.
+    rng (np.random.Generator): Random number generator, the shared default if None.
+    """
+    rng = get_rng(rng)
+    for start in range(0, n, chunk_size):
+        u = 1 - rng.random(min(chunk_size, n - start))  # u in (0, 1] avoids 0 ** (-1 / alpha)
+        yield sigma * (u ** (-1 / alpha) - 1)
+
+
+def checkpoint_indices(n, num_checkpoints=1000):
+    """
+    Log-spaced sample counts 1 <= k <= n at which the running mean is recorded.
+    """
+    return np.unique(np.geomspace(1, n, num_checkpoints).astype(np.int64))
+
+
+def streaming_mean_process(chunks, checkpoints):
+    """
+    Running mean and Welford variance over a stream of sample chunks in constant memory.
+
+    Chunks are merged with the pairwise update of Chan et al., so each chunk only costs
+    one vectorized mean/variance. The running mean is stored at the given checkpoints only.
+
+    Parameters:
+    chunks (iterable): Iterable of 1d sample arrays.
+    checkpoints (np.ndarray): Increasing sample counts at which to record the running mean.
+
+    Returns:
+    tuple: (number of samples, mean, variance, running mean at the checkpoints)
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    checkpoint_means = np.full(len(checkpoints), np.nan)
+    cumsum_before = 0.0
+    for chunk in chunks:
+        chunk_count = chunk.size
+        chunk_mean = np.mean(chunk)
+        chunk_m2 = np.sum((chunk - chunk_mean) ** 2)
+
+        # checkpoints falling into this chunk
+        lo, hi = np.searchsorted(checkpoints, [count + 1, count + chunk_count + 1])
+        if hi > lo:
+            local_cumsum = np.cumsum(chunk)
+            positions = checkpoints[lo:hi]
+            checkpoint_means[lo:hi] = (cumsum_before + local_cumsum[positions - count - 1]) / positions
+        cumsum_before += chunk_count * chunk_mean
+
+        total = count + chunk_count
+        delta = chunk_mean - mean
+        mean += delta * chunk_count / total
+        m2 += chunk_m2 + delta ** 2 * count * chunk_count / total
+        count = total
+    variance = m2 / (count - 1) if count > 1 else np.nan
+    return count, mean, variance, checkpoint_means
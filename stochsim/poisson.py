@@ -0,0 +1,92 @@
+import numpy as np
+
+from .discrete import DiscreteInverseSampler
+from .instrument import instrumented, record
+from .rng import get_rng
+
+PTRS_THRESHOLD = 10  # below: table inversion, above: transformed rejection
+
+
+@instrumented()
+def poisson_ptrs(lam, size, rng=None):
+    """
+    Poisson samples by transformed rejection with squeeze (PTRS, Hoermann 1993), for lam >= 10.
+
+    All pending samples are proposed at once, accepted ones are removed and the loop only
+    continues on the rejected ones (the acceptance rate is about 0.9).
+    """
+    from scipy.special import gammaln
+
+    rng = get_rng(rng)
+    log_lam = np.log(lam)
+    b = 0.931 + 2.53 * np.sqrt(lam)
+    a = -0.059 + 0.02483 * b
+    log_inv_alpha = np.log(1.1239 + 1.1328 / (b - 3.4))
+    v_r = 0.9277 - 3.6224 / (b - 2)
+
+    samples = np.empty(size, dtype=np.int64)
+    pending = np.arange(samples.size)
+    flat = samples.reshape(-1)
+    proposals = 0
+    rounds = 0
+    while pending.size:
+        proposals += pending.size
+        rounds += 1
+        U = rng.random(pending.size) - 0.5
+        V = rng.random(pending.size)
+        us = 0.5 - np.abs(U)
+        k = np.floor((2 * a / us + b) * U + lam + 0.43)
+        accept = (us >= 0.07) & (V <= v_r)
+        check = ~accept & (k >= 0) & ~((us < 0.013) & (V > us))
+        if check.any():
+            kc = k[check]
+            log_ratio = np.log(V[check]) + log_inv_alpha - np.log(a / us[check]**2 + b)
+            accept[check] = log_ratio <= -lam + kc * log_lam - gammaln(kc + 1)
+        flat[pending[accept]] = k[accept]
+        pending = pending[~accept]
+    record("poisson_ptrs", uniforms=2 * proposals, iterations=rounds, proposals=proposals, accepted=samples.size)
+    return samples
+
+
+@instrumented()
+def poisson(lam, size=None, rng=None):
+    """
+    Vectorized Poisson(lam) samples, the algorithm is chosen by lam:
+    table inversion with a cached CDF for lam < PTRS_THRESHOLD, transformed rejection (PTRS) otherwise.
+    """
+    rng = get_rng(rng)
+    shape = () if size is None else size
+    if lam < PTRS_THRESHOLD:
+        samples = DiscreteInverseSampler.poisson(lam).sample(shape, rng)
+    else:
+        samples = poisson_ptrs(lam, shape, rng)
+    return samples if size is not None else int(samples)
+
+
+@instrumented(variates=lambda result: int(np.sum(result[1])))
+def poisson_process(rate, T, n_paths, rng=None):
+    """
+    Arrival times of n_paths homogeneous Poisson processes on [0, T] from exponential interarrivals.
+
+    The interarrival times of all paths are drawn as one matrix, columns are added in
+    blocks until every path has passed T.
+
+    Returns:
+    tuple: (arrival times of shape (n_paths, max(max count, 1)) padded with nan, counts N(T) per path)
+    """
+    if rate < 0:
+        raise ValueError("rate must be non-negative.")
+    rng = get_rng(rng)
+    if rate == 0:
+        record("poisson_process", uniforms=0, iterations=0)
+        return np.full((n_paths, 1), np.nan), np.zeros(n_paths, dtype=int)
+    block = int(rate * T + 6 * np.sqrt(rate * T) + 10)
+    arrival_times = np.cumsum(rng.exponential(1 / rate, (n_paths, block)), axis=1)
+    while np.any(arrival_times[:, -1] <= T):
+        more = arrival_times[:, -1:] + np.cumsum(rng.exponential(1 / rate, (n_paths, block)), axis=1)
+        arrival_times = np.concatenate((arrival_times, more), axis=1)
+    counts = np.sum(arrival_times <= T, axis=1)
+    record("poisson_process", uniforms=arrival_times.size, iterations=arrival_times.shape[1] // block)
+    arrival_times = arrival_times[:, :max(counts.max(), 1)]
+    arrival_times[arrival_times > T] = np.nan
+    return arrival_times, counts
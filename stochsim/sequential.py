@@ -0,0 +1,45 @@
+import numpy as np
+from .parallel import merge_moments
+
+
+def sequential_monte_carlo(weight_generator, batch_size=1000, abs_tol=None, rel_tol=None, confidence=0.95, min_samples=1000, max_samples=10**8):
+    """
+    Monte Carlo estimate of E[W] that stops as soon as the requested precision is reached.
+
+    Batches of weights are pulled from weight_generator, mean and variance are updated
+    online (pairwise Welford update), so no trajectory is stored. Sampling stops when the
+    confidence interval half-width z * s / sqrt(n) is below abs_tol, or below
+    rel_tol * |mean|, or when max_samples is reached.
+
+    Parameters:
+    weight_generator (callable): weight_generator(n) returns an array of n i.i.d. weights.
+    batch_size (int): Number of weights drawn per batch.
+    abs_tol (float): Target absolute half-width of the confidence interval.
+    rel_tol (float): Target half-width relative to the estimate.
+    confidence (float): Confidence level of the interval.
+    min_samples (int): Number of samples drawn before the stopping rule is checked.
+    max_samples (int): Hard limit on the number of samples.
+
+    Returns:
+    tuple: (estimate, variance of the estimate, number of samples used)
+    """
+    if abs_tol is None and rel_tol is None:
+        raise ValueError("Specify abs_tol and/or rel_tol.")
+    from statistics import NormalDist
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    while count < max_samples:
+        weights = np.asarray(weight_generator(min(batch_size, max_samples - count)), dtype=float)
+        batch_mean = np.mean(weights)
+        count, mean, m2 = merge_moments(count, mean, m2, weights.size, batch_mean, np.sum((weights - batch_mean) ** 2))
+
+        if count >= max(min_samples, 2):
+            half_width = z * np.sqrt(m2 / (count - 1) / count)
+            if abs_tol is not None and half_width <= abs_tol:
+                break
+            if rel_tol is not None and half_width <= rel_tol * abs(mean):
+                break
+    variance = m2 / (count - 1) / count if count > 1 else np.nan
+    return mean, variance, count
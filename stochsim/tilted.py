@@ -0,0 +1,160 @@
+import numpy as np
+
+from .ars import AdaptiveRejectionSampler
+from .importance import F_tilde_inv, f_tilde, g
+from .instrument import instrumented, record
+from .rng import get_rng
+from .variance_reduction import (
+    ControlVariate, antithetic, importance_integrand, plain_estimate, stratified_estimate, uniform_integrand,
+)
+
+
+## Importance sampling for theta = int_0^1 exp(x^2) dx with the exponentially tilted proposal f_t(x) = t / (e^t - 1) e^{tx}
+
+
+def log_normalizer(t):
+    # A(t) = log((e^t - 1) / t), with the uniform limit A(0) = 0
+    t = np.asarray(t, dtype=float)
+    t_safe = np.where(t == 0, 1.0, t)
+    return np.where(t == 0, 0.0, np.log(np.expm1(t_safe) / t_safe))
+
+
+def tilted_mean(t):
+    # E_t[X] = A'(t) = 1 / (1 - e^{-t}) - 1 / t, with the series 1/2 + t/12 near 0
+    t = np.asarray(t, dtype=float)
+    small = np.abs(t) < 1e-4
+    t_safe = np.where(small, 1.0, t)
+    return np.where(small, 0.5 + t / 12, -1 / np.expm1(-t_safe) - 1 / t_safe)
+
+
+def tilted_density(x, t):
+    # t / (e^t - 1) * e^{tx}, t = 0 is the uniform density
+    return np.exp(t * x - log_normalizer(t))
+
+def tilted_sampler(t, domain=(0.0, 1.0)):
+    """
+    Adaptive rejection sampler for f_t, optionally truncated to a sub-interval of [0, 1],
+    as an alternative to the closed-form inverse F_tilde_inv_tilted.
+    """
+    return AdaptiveRejectionSampler(lambda x: t * x - log_normalizer(t), domain, dlog_density=lambda x: np.full_like(x, t))
+
+def F_tilde_inv_tilted(u, t):
+    # (1 / t) * log(u * (e^t - 1) + 1), t = 0 is the identity
+    t_safe = np.where(t == 0, 1.0, t)
+    return np.where(t == 0, u, np.log1p(u * np.expm1(t_safe)) / t_safe)
+
+
+def second_moment_estimates(t_values, x_pilot, t_pilot=0.0):
+    """
+    Estimate M(t) = E_t[(g(X) / f_t(X))^2] for every t from one pilot sample drawn from f_{t_pilot}.
+
+    Uses M(t) = E_{t_pilot}[g(X)^2 / (f_t(X) f_{t_pilot}(X))], so no new samples are needed per t.
+    The variance of the importance sampling estimator with n samples is (M(t) - theta^2) / n.
+    """
+    t_values = np.atleast_1d(np.asarray(t_values, dtype=float))
+    base = g(x_pilot) ** 2 / tilted_density(x_pilot, t_pilot)
+    moments = np.empty(t_values.size)
+    for i, t in enumerate(t_values):
+        moments[i] = np.mean(base / tilted_density(x_pilot, t))
+    return moments
+
+
+def _bisect(function, low, high, n_iterations=60):
+    # root of an increasing function on [low, high], clipped to the interval
+    if function(low) >= 0:
+        return low
+    if function(high) <= 0:
+        return high
+    for _ in range(n_iterations):
+        middle = (low + high) / 2
+        if function(middle) > 0:
+            high = middle
+        else:
+            low = middle
+    return (low + high) / 2
+
+
+def tune_tilt(num_pilot=2000, n_iterations=3, method="variance", t_start=0.0, t_bounds=(-20.0, 20.0), rng=None):
+    """
+    Adaptive choice of the tilt t for importance sampling.
+
+    Each iteration draws a pilot sample from the current proposal and updates t:
+    - method="variance": minimizes the reweighted second moment M(t). M is convex in t and
+      dM/dt = -E_{t_pilot}[g^2 / (f_t f_{t_pilot}) (X - E_t[X])], so the minimizer is found
+      by bisection on the gradient.
+    - method="cross_entropy": matches the proposal mean E_t[X] with the mean of the
+      optimal density g f / theta, estimated with weights g / f_{t_pilot}.
+
+    t = 0 (the uniform density) is handled as a regular point.
+
+    Returns:
+    float: The tuned tilt parameter.
+    """
+    rng = get_rng(rng)
+    t = t_start
+    for _ in range(n_iterations):
+        x_pilot = F_tilde_inv_tilted(rng.uniform(0, 1, num_pilot), t)
+        if method == "variance":
+            weights = g(x_pilot) ** 2 / tilted_density(x_pilot, t)
+            gradient = lambda s: -np.mean(weights / tilted_density(x_pilot, s) * (x_pilot - tilted_mean(s)))
+            t = _bisect(gradient, *t_bounds)
+        elif method == "cross_entropy":
+            weights = g(x_pilot) / tilted_density(x_pilot, t)
+            target_mean = np.sum(weights * x_pilot) / np.sum(weights)
+            t = _bisect(lambda s: tilted_mean(s) - target_mean, *t_bounds)
+        else:
+            raise ValueError("Invalid method. Use 'variance' or 'cross_entropy'.")
+    return float(t)
+
+
+@instrumented("tilted.importance_sampling_weights")
+def importance_sampling_weights(num_samples, t=1, rng=None):
+    record("tilted.importance_sampling_weights", uniforms=num_samples)
+    u_samples = get_rng(rng).uniform(0, 1, num_samples)
+    x_samples = F_tilde_inv_tilted(u_samples, t)
+    return g(x_samples) / tilted_density(x_samples, t)
+
+def importance_sampling(num_samples=10000, t=1, num_pilot=2000, rng=None):
+    if isinstance(t, str) and t == 'auto':
+        t = tune_tilt(num_pilot=num_pilot, rng=rng)
+    weights = importance_sampling_weights(num_samples, t, rng=rng)
+    theta_estimate = np.mean(weights)
+
+    # Variance
+    variance = np.var(weights) / num_samples
+
+    # Running mean
+    running_mean = np.cumsum(weights) / np.arange(1, num_samples + 1)
+    return theta_estimate, variance, running_mean
+
+
+def theta_estimators(t=1.0, n_strata=16):
+    """
+    Estimators of theta for compare_estimators: plain MC, the proposals of Sheet11 (task 3)
+    and Sheet12 (tilt t), and the tilted proposal with antithetic pairing, an online control
+    variate and Neyman-stratified sampling stacked on top. The control is c(u) = u on its own
+    and c(u) = (u - 1/2)^2 after antithetic pairing, which makes the integrand symmetric in u.
+
+    Returns:
+    dict: name -> estimator(n, rng) returning (estimate, variance).
+    """
+    plain = uniform_integrand(g)
+    exponential = importance_integrand(g, lambda x: f_tilde(x, task=3), lambda u: F_tilde_inv(u, task=3))
+    tilted = importance_integrand(g, lambda x: tilted_density(x, t), lambda u: F_tilde_inv_tilted(u, t))
+
+    def symmetric_control(u):
+        return (u - 0.5) ** 2
+
+    # antithetic pairs use two evaluations per draw, so they get half the draws
+    return {
+        "plain MC": lambda n, rng: plain_estimate(plain, n, rng=rng),
+        "IS exponential": lambda n, rng: plain_estimate(exponential, n, rng=rng),
+        "IS tilted": lambda n, rng: plain_estimate(tilted, n, rng=rng),
+        "IS tilted + antithetic": lambda n, rng: plain_estimate(antithetic(tilted), n // 2, rng=rng),
+        "IS tilted + control variate": lambda n, rng: plain_estimate(ControlVariate(tilted, lambda u: u, 0.5), n, rng=rng),
+        "IS tilted + stratified": lambda n, rng: stratified_estimate(tilted, n, n_strata, rng=rng),
+        "plain MC + antithetic + control + stratified": lambda n, rng: stratified_estimate(
+            ControlVariate(antithetic(plain), symmetric_control, 1 / 12), n // 2, n_strata, rng=rng),
+        "IS tilted + antithetic + control + stratified": lambda n, rng: stratified_estimate(
+            ControlVariate(antithetic(tilted), symmetric_control, 1 / 12), n // 2, n_strata, rng=rng),
+    }
@@ -0,0 +1,196 @@
+import time
+import numpy as np
+
+from .rng import get_rng
+
+
+## Composable variance reduction for integrals over the unit cube
+#
+# Every layer works on an integrand h(u) of uniforms u ~ U(0,1) (shape (n,) or (n, d)) with
+# E[h(U)] = theta and returns a new integrand with the same expectation, so layers stack:
+#
+#   h = importance_integrand(g, f_tilde, F_tilde_inv)      # IS proposal as a map of uniforms
+#   h = antithetic(h)                                      # pair u with 1 - u
+#   h = ControlVariate(h, lambda u: (u - 0.5)**2, 1 / 12)  # online coefficient, symmetric
+#                                                          # control after antithetic pairing
+#   estimate, variance = stratified_estimate(h, 10**5)     # Neyman allocation from a pilot
+
+
+def uniform_integrand(g):
+    """Plain Monte Carlo: h(u) = g(u)."""
+    return g
+
+
+def importance_integrand(g, density, inverse_cdf):
+    """
+    Importance sampling as an integrand of uniforms: h(u) = g(x) / f(x) with x = F^{-1}(u).
+
+    Parameters:
+    g (callable): Integrand on [0,1].
+    density (callable): Proposal density f.
+    inverse_cdf (callable): Inverse CDF of the proposal, e.g. F_tilde_inv or F_tilde_inv_tilted.
+    """
+    def h(u):
+        x = inverse_cdf(u)
+        return g(x) / density(x)
+    return h
+
+
+def antithetic(h):
+    """Antithetic pairing: h_a(u) = (h(u) + h(1 - u)) / 2, one value per pair."""
+    def h_antithetic(u):
+        return 0.5 * (h(u) + h(1 - u))
+    return h_antithetic
+
+
+class ControlVariate:
+    """
+    Integrand h(u) - beta * (c(u) - c_mean) with a control c of known mean c_mean.
+
+    The coefficient beta = Cov(h, c) / Var(c) is estimated online: every call uses the moments
+    accumulated over all previous calls, so beta is independent of the batch it is applied to
+    and that batch is estimated without bias. The first call has no history and uses its own
+    moments, which biases its result by O(1 / batch size); run a pilot batch first (as the
+    pilot of stratified_estimate does) where this matters.
+
+    The control has to be correlated with h: after the antithetic layer h(u) = h(1 - u), so
+    an odd control such as c(u) = u has Cov(h, c) = 0 and a symmetric one like (u - 1/2)^2
+    is needed.
+    """
+
+    def __init__(self, h, control, control_mean):
+        self.h = h
+        self.control = control
+        self.control_mean = control_mean
+        self.count = 0
+        self.mean_h = 0.0
+        self.mean_c = 0.0
+        self.cov_hc = 0.0  # sums of co-deviations
+        self.m2_c = 0.0
+
+    @property
+    def beta(self):
+        return self.cov_hc / self.m2_c if self.m2_c > 0 else 0.0
+
+    def _update(self, h_values, c_values):
+        # pairwise (Chan et al.) merge of the batch moments into the running moments
+        n = h_values.size
+        mean_h, mean_c = np.mean(h_values), np.mean(c_values)
+        cov_hc = np.sum((h_values - mean_h) * (c_values - mean_c))
+        m2_c = np.sum((c_values - mean_c) ** 2)
+        count = self.count + n
+        delta_h, delta_c = mean_h - self.mean_h, mean_c - self.mean_c
+        self.cov_hc += cov_hc + delta_h * delta_c * self.count * n / count
+        self.m2_c += m2_c + delta_c**2 * self.count * n / count
+        self.mean_h += delta_h * n / count
+        self.mean_c += delta_c * n / count
+        self.count = count
+
+    def __call__(self, u):
+        h_values = np.asarray(self.h(u), dtype=float).ravel()
+        c_values = np.asarray(self.control(u), dtype=float).ravel()
+        if self.count == 0:
+            self._update(h_values, c_values)
+            beta = self.beta
+        else:
+            beta = self.beta
+            self._update(h_values, c_values)
+        return h_values - beta * (c_values - self.control_mean)
+
+
+def _draw(rng, n, d, low=0.0, high=1.0):
+    # uniforms with the first coordinate in [low, high)
+    if d is None:
+        return low + (high - low) * rng.random(n)
+    u = rng.random((n, d))
+    u[:, 0] = low + (high - low) * u[:, 0]
+    return u
+
+
+def plain_estimate(h, n, d=None, rng=None):
+    """
+    Sample mean of h over n uniforms.
+
+    Returns:
+    tuple: (estimate, variance of the estimate)
+    """
+    values = np.asarray(h(_draw(get_rng(rng), n, d)), dtype=float)
+    return np.mean(values), np.var(values, ddof=1) / n
+
+
+def stratified_estimate(h, n, n_strata=16, pilot_size=None, d=None, rng=None):
+    """
+    Stratified estimate of E[h(U)] over n_strata equal strata of the first coordinate.
+
+    A pilot run of pilot_size draws (split evenly over the strata) estimates the standard
+    deviation sigma_k of h in every stratum, the n draws of the main run are then allocated
+    Neyman-optimally, n_k proportional to sigma_k (at least 2 per stratum).
+
+    Parameters:
+    h (callable): Integrand of uniforms.
+    n (int): Draws of the main run.
+    n_strata (int): Number of strata.
+    pilot_size (int): Draws of the pilot run, defaults to max(n // 10, 4 * n_strata).
+    d (int): Dimension of the uniforms, None for 1-d arrays.
+
+    Returns:
+    tuple: (estimate, variance of the estimate)
+    """
+    rng = get_rng(rng)
+    if pilot_size is None:
+        pilot_size = max(n // 10, 4 * n_strata)
+    edges = np.linspace(0, 1, n_strata + 1)
+
+    def evaluate(counts):
+        # one call of h for all strata, so a stateful layer (ControlVariate) applies one
+        # coefficient to the whole run and the strata stay consistent
+        u = np.concatenate([_draw(rng, count, d, edges[k], edges[k + 1]) for k, count in enumerate(counts)])
+        return np.split(np.asarray(h(u), dtype=float), np.cumsum(counts)[:-1])
+
+    pilot_per_stratum = max(pilot_size // n_strata, 2)
+    sigma = np.array([np.std(values, ddof=1) for values in evaluate([pilot_per_stratum] * n_strata)])
+    if np.sum(sigma) > 0:
+        allocation = np.maximum(np.floor(n * sigma / np.sum(sigma)).astype(np.int64), 2)
+    else:
+        allocation = np.full(n_strata, max(n // n_strata, 2))
+
+    strata = evaluate(allocation)
+    estimate = sum(np.mean(values) for values in strata) / n_strata
+    variance = sum(np.var(values, ddof=1) / values.size for values in strata) / n_strata**2
+    return estimate, variance
+
+
+def compare_estimators(estimators, n, repeats=3, rng=None):
+    """
+    Work-normalized efficiency 1 / (variance * seconds) of estimators at equal sample size.
+
+    Parameters:
+    estimators (dict): name -> estimator(n, rng) returning (estimate, variance).
+    n (int): Sample size passed to every estimator.
+    repeats (int): Runs per estimator, the fastest one is timed.
+
+    Returns:
+    list: one dict per estimator with name, estimate, variance, seconds, efficiency and
+    relative_efficiency (efficiency divided by that of the first estimator).
+    """
+    rng = get_rng(rng)
+    rows = []
+    for name, estimator in estimators.items():
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            estimate, variance = estimator(n, rng)
+            seconds = time.perf_counter() - start
+            if best is None or seconds < best[2]:
+                best = (estimate, variance, seconds)
+        estimate, variance, seconds = best
+        rows.append({
+            "name": name,
+            "estimate": float(estimate),
+            "variance": float(variance),
+            "seconds": seconds,
+            "efficiency": 1 / (variance * seconds) if variance > 0 and seconds > 0 else np.inf,
+        })
+    for row in rows:
+        row["relative_efficiency"] = row["efficiency"] / rows[0]["efficiency"]
+    return rows
@@ -0,0 +1,109 @@
+import math
+import time
+import numpy as np
+from itertools import product
+
+from .instrument import instrumented, record
+from .rng import make_rng
+from .variance_reduction import antithetic
+
+
+def h(u):
+    """Indicator for unit ball after transformation"""
+    x = 2 * u - 1
+    return np.sum(x**2) <= 1
+
+
+@instrumented(variates=lambda result: 1)
+def monte_carlo_volume(d, m, seed=0, rng=None):
+    rng = make_rng(seed) if rng is None else rng
+    n = m**d
+    record("monte_carlo_volume", uniforms=n * d)
+    start = time.time()
+    U = rng.random((n, d)) # n samples in d dimensions
+    values = np.sum((2 * U - 1) ** 2, axis=1) <= 1  # 1 for inside the ball, 0 otherwise
+    estimate = (2**d) * np.mean(values)  # 1s inside the ball divided by total samples is mean times volume of cube. bc volume ball / volume cube = points inside / total points = mean
+    runtime = time.time() - start
+    return estimate, runtime
+
+
+@instrumented(variates=lambda result: 1)
+def anithetic_variates_volume(d, m, seed=0, rng=None):
+    rng = make_rng(seed) if rng is None else rng
+    n = m**d // 2
+    record("anithetic_variates_volume", uniforms=n * d)
+    start = time.time()
+    pairs = antithetic(lambda U: (np.sum((2 * U - 1) ** 2, axis=1) <= 1).astype(float))
+    estimate = (2**d) * np.mean(pairs(rng.random((n, d))))
+    runtime = time.time() - start
+    return estimate, runtime
+
+
+def riemann_volume(d, m):
+    start = time.time()
+    grid_1d = (np.arange(m) + 0.5) / m  # m midpoints in [0,1]
+    count = 0
+    for u in product(grid_1d, repeat=d):  # product generates all d-dimensional grid points
+        count += h(np.array(u))  # h(u) is 1 if inside ball, 0 otherwise
+    estimate = (2**d) * count / (m**d)
+    runtime = time.time() - start
+    return estimate, runtime
+
+
+def grid_integral(f, d, m, chunk_size=2**20):
+    """
+    Midpoint rule for int_{[0,1]^d} f(u) du on the m^d grid, evaluated in chunks.
+
+    Parameters:
+    f (callable): Vectorized integrand mapping an (n, d) array to n values.
+    d (int): Dimension.
+    m (int): Grid points per dimension.
+    chunk_size (int): Maximum number of grid points held in memory at once.
+    """
+    grid_1d = (np.arange(m) + 0.5) / m
+    total = 0.0
+    for start in range(0, m**d, chunk_size):
+        index = np.unravel_index(np.arange(start, min(start + chunk_size, m**d)), (m,) * d)
+        total += np.sum(f(grid_1d[np.stack(index, axis=1)]))
+    return total / m**d
+
+
+def riemann_volume_vectorized(d, m, chunk_size=2**20):
+    """
+    Same estimate as riemann_volume without visiting the grid point by point.
+
+    The midpoints x = 2u - 1 are symmetric around 0, so only the orthant of |x| values is
+    used, each value weighted by how often it occurs. Partial sums of x_i^2 are built one
+    dimension at a time in chunks and pruned as soon as they exceed 1, and the last
+    dimension is counted with a single searchsorted.
+    """
+    start = time.time()
+    x_1d = np.abs(2 * (np.arange(m) + 0.5) / m - 1)
+    x_pos, multiplicity = np.unique(x_1d, return_counts=True)
+    x2 = x_pos ** 2
+    cumulative_multiplicity = np.concatenate(([0], np.cumsum(multiplicity)))
+
+    rows = max(1, chunk_size // x2.size)
+    partial = np.zeros(1)
+    weight = np.ones(1)
+    for _ in range(d - 1):
+        new_partial, new_weight = [], []
+        for begin in range(0, partial.size, rows):
+            p = (partial[begin:begin + rows, None] + x2).ravel()
+            w = (weight[begin:begin + rows, None] * multiplicity).ravel()
+            inside = p <= 1
+            new_partial.append(p[inside])
+            new_weight.append(w[inside])
+        partial = np.concatenate(new_partial)
+        weight = np.concatenate(new_weight)
+    last = np.searchsorted(x2, 1 - partial, side='right')
+    count = np.sum(weight * cumulative_multiplicity[last])
+
+    estimate = (2**d) * count / (m**d)
+    runtime = time.time() - start
+    return estimate, runtime
+
+
+def exact_volume(d):
+    # Unit ball volume formula
+    return (np.pi ** (d / 2)) / math.gamma(d / 2 + 1)
@@ -0,0 +1,29 @@
+import numpy as np
+
+from stochsim.alias import AliasTable
+
+
+def test_table_reproduces_the_probabilities():
+    P = np.array([0.05, 0.4, 0.0, 0.25, 0.3])
+    table = AliasTable(P)
+    m = P.size
+    # column i returns i with prob[i] / m and is the alias of the other columns otherwise
+    exact = table.prob / m
+    np.add.at(exact, table.alias, (1 - table.prob) / m)
+    np.testing.assert_allclose(exact, P, atol=1e-12)
+
+
+def test_samples_follow_the_distribution():
+    P = np.array([1, 2, 3, 4], dtype=float) / 10
+    samples = AliasTable.from_probabilities(P).sample(10**6, rng=np.random.default_rng(0))
+    frequencies = np.bincount(samples, minlength=P.size) / samples.size
+    np.testing.assert_allclose(frequencies, P, atol=5 * np.sqrt(0.25 / samples.size))
+    assert AliasTable.from_probabilities(P) is AliasTable.from_probabilities(P.copy())
+
+
+def test_table_cache_is_bounded():
+    from stochsim.alias import TABLE_CACHE_SIZE, _cached_table
+    rng = np.random.default_rng(1)
+    for _ in range(TABLE_CACHE_SIZE + 10):
+        AliasTable.from_probabilities(rng.dirichlet(np.ones(4)))
+    assert _cached_table.cache_info().currsize == TABLE_CACHE_SIZE
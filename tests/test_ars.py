@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from stochsim.ars import AdaptiveRejectionSampler
+
+
+@pytest.mark.parametrize("log_density, domain, initial_points, distribution", [
+    (lambda x: -0.5 * x**2, (-np.inf, np.inf), [-1.0, 1.0], stats.norm()),
+    (lambda x: 2 * np.log(x) - x, (0.0, np.inf), [1.0, 5.0], stats.gamma(3)),
+    (lambda x: -0.5 * x**2, (1.0, 3.0), None, stats.truncnorm(1.0, 3.0)),
+    (lambda x: 1.5 * np.log(x) + 3 * np.log1p(-x), (0.0, 1.0), None, stats.beta(2.5, 4)),
+])
+def test_samples_follow_the_density(log_density, domain, initial_points, distribution):
+    sampler = AdaptiveRejectionSampler(log_density, domain, initial_points)
+    samples = sampler.sample(50000, rng=np.random.default_rng(0))
+    assert stats.kstest(samples, distribution.cdf).pvalue > 1e-3
+    assert np.all((samples > domain[0]) & (samples < domain[1]))
+    assert sampler.acceptance_rate > 0.95
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        AdaptiveRejectionSampler(lambda x: -0.5 * x**2)  # unbounded without initial points
+    with pytest.raises(ValueError):
+        AdaptiveRejectionSampler(lambda x: -0.5 * x**2, initial_points=[1.0, 2.0])  # no mode to the left
+    with pytest.raises(ValueError):
+        AdaptiveRejectionSampler(lambda x: x**4, (-1.0, 1.0), [-0.5, 0.1, 0.5])  # not concave
+    with pytest.raises(ValueError):
+        AdaptiveRejectionSampler(lambda x: np.where(x < 1, -np.inf, -x), (0.0, np.inf), [0.5, 2.0])  # -inf at a point
+    with pytest.raises(ValueError):
+        AdaptiveRejectionSampler(lambda x: np.zeros_like(x), (0.0, np.inf), [1.0, 2.0], dlog_density=np.zeros_like)
+
+
+def test_no_progress_raises_instead_of_looping():
+    sampler = AdaptiveRejectionSampler(lambda x: np.where(np.abs(x) <= 1e-9, -0.5 * x**2, -np.inf), initial_points=[-1e-9, 1e-9],
+                                       dlog_density=lambda x: -x, max_points=2)
+    with pytest.raises(RuntimeError):
+        sampler.sample(100, rng=np.random.default_rng(0), max_batch_size=4096)
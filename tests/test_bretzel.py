@@ -0,0 +1,29 @@
+import numpy as np
+from itertools import product
+
+from stochsim.bretzel import expected_profit, optimal_production, pmf_bretzels_per_day, simulate_days
+
+
+def test_pmf_matches_enumeration():
+    pmf = pmf_bretzels_per_day()
+    exact = np.zeros(25)
+    for customers in range(9):
+        for bretzels in product((1, 2, 3), repeat=customers):
+            exact[sum(bretzels)] += 1 / 9 / 3**customers
+    np.testing.assert_allclose(pmf, exact, atol=1e-12)
+
+
+def test_optimal_production():
+    pmf = pmf_bretzels_per_day()
+    q, profit = optimal_production(pmf)
+    assert q == 11
+    assert abs(profit - 2.4329) < 1e-4
+    profits = expected_profit(np.arange(25), pmf)
+    assert np.argmax(profits) == q
+
+
+def test_simulation_agrees_with_exact_profit():
+    pmf = pmf_bretzels_per_day()
+    q = np.array([5, 11, 20])
+    profits = simulate_days(q, 200000, rng=np.random.default_rng(1))
+    np.testing.assert_allclose(np.mean(profits, axis=-1), expected_profit(q, pmf), atol=0.03)
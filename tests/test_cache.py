@@ -0,0 +1,65 @@
+import importlib
+import sys
+import numpy as np
+import pytest
+
+from stochsim.cache import ResultCache, cache_key, code_version, function_fingerprint
+from stochsim.mvn import MVNSampler
+
+
+def draw(n, scale=1.0, rng=None):
+    return scale * rng.random(n), float(n)
+
+
+def test_hits_return_the_stored_arrays(tmp_path):
+    cache = ResultCache(str(tmp_path), mmap_threshold=1024)
+    first, n = cache.get_or_compute(draw, {"n": 10**4}, seed=1)
+    second, _ = cache.get_or_compute(draw, {"n": 10**4}, seed=1)
+    assert isinstance(second, np.memmap) and n == 10**4
+    np.testing.assert_array_equal(first, second)
+    assert len(cache.entries()) == 1
+    other, _ = cache.get_or_compute(draw, {"n": 10**4, "scale": 2.0}, seed=1)
+    np.testing.assert_array_equal(other, 2 * first)
+    cache.get_or_compute(draw, {"n": 10}, seed=None)
+    assert len(cache.entries()) == 2
+
+
+def test_eviction_and_clear(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=3 * 8 * 10**4)
+    for seed in range(5):
+        cache.get_or_compute(draw, {"n": 10**4}, seed=seed)
+    assert 0 < sum(size for _, size, _ in cache.entries()) <= cache.max_bytes
+    assert len(cache.entries()) < 5
+    cache.clear()
+    assert cache.entries() == []
+
+
+def test_callables_in_parameters_are_rejected():
+    with pytest.raises(TypeError):
+        cache_key(draw, {"n": 10, "transform": lambda x: x}, seed=0)
+    assert cache_key(draw, {"dtype": np.float32}, 0) == cache_key(draw, {"dtype": np.float32}, 0)
+    assert cache_key(draw, {"n": 10}, 0) != cache_key(draw, {"n": 10}, 1)
+
+
+def test_bound_methods_are_keyed_by_their_object(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    a = cache.cached(MVNSampler(np.zeros(2), np.eye(2)).sample)(100, seed=0)
+    b = cache.cached(MVNSampler(np.zeros(2), 4 * np.eye(2)).sample)(100, seed=0)
+    np.testing.assert_allclose(b, 2 * a)
+    assert len(cache.entries()) == 2
+
+
+def test_foreign_functions_hash_their_module(tmp_path, monkeypatch):
+    module_path = tmp_path / "user_experiment.py"
+    module_path.write_text("def helper(x):\n    return x\n\ndef run(n, rng=None):\n    return helper(rng.random(n))\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import user_experiment
+    before = function_fingerprint(user_experiment.run)
+    module_path.write_text("def helper(x):\n    return 2 * x\n\ndef run(n, rng=None):\n    return helper(rng.random(n))\n")
+    importlib.reload(user_experiment)
+    assert function_fingerprint(user_experiment.run) != before
+    del sys.modules["user_experiment"]
+
+
+def test_code_version_includes_the_package_sources():
+    assert "+" in code_version()
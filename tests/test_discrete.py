@@ -0,0 +1,29 @@
+import numpy as np
+from scipy import stats
+
+from stochsim.discrete import (
+    DiscreteInverseSampler, binomial_log_pmf, negative_binomial_log_pmf, poisson_log_pmf,
+    recursion_inverse_transform_negative_binomial, inverse_transform_negative_binomial,
+)
+
+
+def test_log_pmfs_match_scipy():
+    k = np.arange(40)
+    np.testing.assert_allclose(binomial_log_pmf(30, 0.3, k[:31]), stats.binom.logpmf(k[:31], 30, 0.3))
+    np.testing.assert_allclose(negative_binomial_log_pmf(4, 0.35, k), stats.nbinom.logpmf(k, 4, 0.35))
+    np.testing.assert_allclose(poisson_log_pmf(6.5, k), stats.poisson.logpmf(k, 6.5))
+
+
+def test_degenerate_parameters_are_point_masses():
+    with np.errstate(all="raise"):
+        np.testing.assert_array_equal(np.exp(binomial_log_pmf(4, 0.0, np.arange(5))), [1, 0, 0, 0, 0])
+        np.testing.assert_array_equal(np.exp(binomial_log_pmf(4, 1.0, np.arange(5))), [0, 0, 0, 0, 1])
+        np.testing.assert_array_equal(np.exp(negative_binomial_log_pmf(3, 1.0, np.arange(3))), [1, 0, 0])
+        np.testing.assert_array_equal(np.exp(poisson_log_pmf(0.0, np.arange(3))), [1, 0, 0])
+
+
+def test_table_sampler_agrees_with_scalar_inversion():
+    u = np.random.default_rng(2).random(200)
+    table = DiscreteInverseSampler.negative_binomial(3, 0.4).sample_from_uniforms(u)
+    assert table.tolist() == [inverse_transform_negative_binomial(3, 0.4, x) for x in u]
+    assert table.tolist() == [recursion_inverse_transform_negative_binomial(3, 0.4, x) for x in u]
@@ -0,0 +1,27 @@
+import math
+import numpy as np
+
+from stochsim.ellipsoid import acception_rejection, block_acceptance_rejection
+from stochsim.instrument import profiling
+
+
+def test_acceptance_probability_is_the_volume_ratio(capsys):
+    weights = np.array([0.25, 1.0, 4.0])
+    points, probability = block_acceptance_rejection(weights, 1.0, 20000, rng=np.random.default_rng(0))
+    assert points.shape == (20000, 3)
+    assert np.all((points ** 2) @ weights < 1)
+    assert abs(probability - np.pi / 6) < 0.01
+    points, probability = acception_rejection(0.25, 1, 4, 1, 2000, rng=np.random.default_rng(0))
+    assert len(points) == 2000 and abs(probability - np.pi / 6) < 0.03
+    assert capsys.readouterr().out == ""
+
+
+def test_batches_are_capped():
+    d = 8
+    ratio = math.pi ** (d / 2) / math.gamma(d / 2 + 1) / 2 ** d
+    with profiling() as profile:
+        points, probability = block_acceptance_rejection(np.ones(d), 1.0, 500, rng=np.random.default_rng(1), max_batch_size=4096)
+    stats = profile.stats["block_acceptance_rejection"]
+    assert stats["uniforms"] <= stats["iterations"] * 4096 * d
+    assert points.shape == (500, d)
+    assert abs(probability - ratio) < 5 * np.sqrt(ratio / stats["proposals"])
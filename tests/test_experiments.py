@@ -0,0 +1,73 @@
+import csv
+import io
+import numpy as np
+import pytest
+
+from stochsim.experiments import EXPERIMENTS, main, parse_grid, run_sweep, save_figure
+
+SMALL = {
+    "bretzel": {"n_days": 500},
+    "pareto_mean": {"n": 10000, "num_checkpoints": 10},
+    "binomial": {"sample_size": 1000},
+    "negative_binomial": {"sample_size": 1000},
+    "poisson": {"sample_size": 1000},
+    "is_tilt": {"num_samples": 1000},
+    "volume": {"m": 10},
+    "lcg_period": {},
+    "middle_square": {},
+    "ellipsoid": {"n": 1000},
+    "alias": {"sample_size": 1000, "n": 20},
+    "mvn": {"N": 2000, "n": 10},
+    "ecdf": {"n": 1000},
+    "is_comparison": {"num_samples": 1000},
+}
+
+
+def test_every_experiment_runs():
+    assert set(SMALL) == set(EXPERIMENTS)
+    for name, overrides in SMALL.items():
+        table = run_sweep(name, overrides)
+        assert len({column.size for column in table.values()}) == 1
+
+
+def test_results():
+    assert run_sweep("lcg_period")["full_period"].tolist() == [True]
+    table = run_sweep("lcg_period", grid={"a": [4, 133]})
+    assert table["full_period"].tolist() == table["hull_dobell"].tolist() == [False, True]
+    assert run_sweep("middle_square")["seeds"].sum() == 10000
+    table = run_sweep("ellipsoid", {"n": 20000})
+    assert abs(table["volume"][0] - table["exact_volume"][0]) < 0.1
+    table = run_sweep("ecdf", {"n": 50000})
+    assert np.max(np.abs(table["empirical_cdf"] - table["cdf"])) < 0.02
+    table = run_sweep("is_comparison", {"num_samples": 10**5})
+    np.testing.assert_allclose(table["estimate"], 1.4627, atol=0.01)
+
+
+def test_every_volume_method():
+    table = run_sweep("volume", {"d": 3, "m": 20}, {"method": ["mc", "antithetic", "riemann", "rqmc"]})
+    assert table["method"].tolist() == ["mc", "antithetic", "riemann", "rqmc"]
+    np.testing.assert_allclose(table["estimate"], table["exact"], rtol=0.1)
+
+
+def test_sweep_does_not_depend_on_workers():
+    grid = {"t": parse_grid("0:2:3")}
+    one = run_sweep("is_tilt", {"num_samples": 1000}, grid, seed=3, n_workers=1)
+    two = run_sweep("is_tilt", {"num_samples": 1000}, grid, seed=3, n_workers=2)
+    np.testing.assert_array_equal(one["estimate"], two["estimate"])
+
+
+def test_stdout_is_only_the_table(capsys):
+    assert main(["is_comparison", "--set", "num_samples=100", "--grid", "num_samples=100,200"]) == 0
+    captured = capsys.readouterr()
+    rows = list(csv.reader(io.StringIO(captured.out)))
+    assert rows[0] == ["point", "num_samples", "method", "estimate", "variance"]
+    assert len(rows) == 7
+    assert "is_comparison: 2 point(s)" in captured.err
+
+
+def test_figures(tmp_path):
+    pytest.importorskip("matplotlib")
+    for name, grid in [("ecdf", {}), ("alias", {}), ("is_comparison", {"num_samples": [100, 1000]}), ("mvn", {"method": ["cholesky", "factor"]})]:
+        overrides = {key: value for key, value in SMALL[name].items() if key not in grid}
+        save_figure(name, run_sweep(name, overrides, grid), list(grid), str(tmp_path / f"{name}.png"))
+        assert (tmp_path / f"{name}.png").stat().st_size > 0
@@ -0,0 +1,44 @@
+import functools
+import numpy as np
+import pytest
+
+from stochsim.discrete import binomial_log_pmf, poisson_log_pmf
+from stochsim.histogram import CountHistogram, goodness_of_fit, parallel_histogram
+from stochsim.poisson import poisson
+
+
+def test_update_and_merge():
+    a = CountHistogram().update([0, 1, 1, 5])
+    b = CountHistogram().update([2, 7])
+    merged = a + b
+    assert merged.counts.tolist() == [1, 2, 1, 0, 0, 1, 0, 1]
+    assert merged.total == 6
+    capped = CountHistogram(3).update([-1, 0, 3, 4, 9])
+    assert capped.counts.tolist() == [1, 0, 0, 1] and capped.overflow == 3
+    with pytest.raises(ValueError):
+        capped.merge(a)
+    with pytest.raises(ValueError):
+        CountHistogram().update([-1])
+
+
+def test_goodness_of_fit_accepts_the_right_law_and_rejects_a_wrong_one():
+    rng = np.random.default_rng(0)
+    histogram = CountHistogram(30).update(rng.binomial(30, 0.4, 10**6))
+    right = goodness_of_fit(histogram, lambda k: binomial_log_pmf(30, 0.4, k))
+    wrong = goodness_of_fit(histogram, lambda k: binomial_log_pmf(30, 0.405, k))
+    assert right["p_value"] > 1e-3 and right["ks_scaled"] < 1.63 and right["total_variation"] < 0.005
+    assert wrong["p_value"] < 1e-6
+
+
+def test_parallel_histogram_does_not_depend_on_workers():
+    sampler = functools.partial(poisson, 20.0)
+    one = parallel_histogram(sampler, 300000, seed=4, block_size=100000, chunk_size=30000, n_workers=1)
+    two = parallel_histogram(sampler, 300000, seed=4, block_size=100000, chunk_size=30000, n_workers=2)
+    np.testing.assert_array_equal(one.counts, two.counts)
+    assert one.total == 300000
+    assert goodness_of_fit(one, lambda k: poisson_log_pmf(20.0, k))["p_value"] > 1e-3
+
+
+def test_empty_histogram_is_rejected():
+    with pytest.raises(ValueError):
+        goodness_of_fit(CountHistogram(), lambda k: poisson_log_pmf(1.0, k))
@@ -0,0 +1,53 @@
+import json
+import numpy as np
+
+from stochsim import instrument
+from stochsim.alias import AliasTable
+from stochsim.discrete import DiscreteInverseSampler
+from stochsim.instrument import instrumented, profiling, record, stage
+from stochsim.poisson import poisson
+
+
+def test_counters_of_the_samplers(tmp_path):
+    with profiling() as profile:
+        poisson(100.0, 10**4, rng=np.random.default_rng(0))
+        AliasTable.from_probabilities([0.2, 0.3, 0.5]).sample(1000, rng=np.random.default_rng(0))
+    rows = profile.summary()
+    assert rows["poisson"]["calls"] == 1 and rows["poisson"]["variates"] == 10**4
+    ptrs = rows["poisson_ptrs"]
+    assert ptrs["accepted"] == 10**4 and 1 < ptrs["uniforms_per_variate"] < 2.5
+    assert 0.5 < ptrs["acceptance_rate"] <= 1
+    assert rows["AliasTable.sample"]["uniforms"] == 2000
+    profile.save(tmp_path / "profile.json")
+    saved = json.loads((tmp_path / "profile.json").read_text())
+    assert saved["samplers"]["poisson"]["variates"] == 10**4
+    assert "poisson" in profile.report()
+
+
+def test_nothing_is_recorded_when_off():
+    assert instrument.active() is None
+    poisson(5.0, 100, rng=np.random.default_rng(0))
+    record("anything", uniforms=1)
+    with stage("anything", "setup"):
+        pass
+    with profiling() as outer:
+        with profiling() as inner:
+            poisson(5.0, 100, rng=np.random.default_rng(0))
+        assert instrument.active() is outer
+    assert instrument.active() is None
+    assert "poisson" in inner.stats and not outer.stats
+
+
+def test_stages_and_memory():
+    @instrumented("allocate")
+    def allocate(n):
+        with stage("allocate", "fill"):
+            return np.ones(n)
+
+    with profiling(trace_memory=True) as profile:
+        allocate(10**6)
+        DiscreteInverseSampler.poisson(3.0).sample(1000, rng=np.random.default_rng(0))
+    entry = profile.stats["allocate"]
+    assert entry["output_bytes"] == 8 * 10**6
+    assert entry["peak_bytes"] >= 8 * 10**6
+    assert entry["stages"]["fill"] > 0
@@ -0,0 +1,86 @@
+import numpy as np
+
+from stochsim.lcg import LCG, lcg_random
+
+
+def test_full_period_matches_hull_dobell():
+    for a, c, m in [(5, 3, 16), (4, 3, 16), (5, 4, 16), (13, 7, 64), (3, 1, 9), (2, 1, 9)]:
+        x, seen = 0, set()
+        for _ in range(m):
+            seen.add(x)
+            x = lcg_random(x, a, c, m)
+        assert LCG(0, a, c, m).has_full_period() == (len(seen) == m)
+
+
+def test_blocks_match_the_recursion():
+    a, c, m = 1103515245, 12345, 2**31
+    generator = LCG(42, a, c, m, block_size=7)
+    x, expected = 42, []
+    for _ in range(50):
+        x = lcg_random(x, a, c, m)
+        expected.append(x)
+    assert generator.random_raw(20).tolist() == expected[:20]
+    assert generator.random_raw(30).tolist() == expected[20:]
+
+
+def test_jump_ahead_and_spawn():
+    a, c, m = 6364136223846793005, 1442695040888963407, 2**64
+    reference = LCG(7, a, c, m, block_size=64)
+    values = reference.random_raw(1000)
+    assert LCG(7, a, c, m).jump(499).random_raw() == values[499]
+    streams = LCG(7, a, c, m).spawn(4, 250)
+    for i, stream in enumerate(streams):
+        assert np.array_equal(stream.random_raw(250), values[250 * i:250 * (i + 1)])
+
+
+def _generator():
+    return LCG(12345, 6364136223846793005, 1442695040888963407, 2**64)
+
+
+def test_generator_interface():
+    rng = _generator()
+    assert rng.random((3, 4)).shape == (3, 4)
+    assert isinstance(rng.random(), float)
+    integers = rng.integers(2, 7, (1000, 2))
+    assert integers.shape == (1000, 2) and integers.min() == 2 and integers.max() == 6
+    assert isinstance(rng.integers(5), int)
+    assert np.array_equal(np.sort(rng.permutation(10)), np.arange(10))
+    assert len(set(rng.choice(20, 20, replace=False).tolist())) == 20
+    normals = rng.standard_normal(10**5 + 1)
+    assert normals.size == 10**5 + 1
+    assert abs(normals.mean()) < 0.02 and abs(normals.var() - 1) < 0.02
+    out = np.empty((10, 3), dtype=np.float32)
+    assert rng.standard_normal((10, 3), dtype=np.float32, out=out) is out
+    assert abs(rng.exponential(2.0, 10**5).mean() - 2.0) < 0.05
+
+
+def test_lcg_as_rng_of_the_samplers():
+    from stochsim.ars import AdaptiveRejectionSampler
+    from stochsim.bretzel import simulate_days
+    from stochsim.mvn import MVNSampler
+    from stochsim.poisson import poisson, poisson_process
+
+    assert simulate_days([5, 10], 100, rng=_generator()).shape == (2, 100)
+    assert MVNSampler(np.zeros(2), np.eye(2)).sample(100, rng=_generator()).shape == (100, 2)
+    assert abs(poisson(50.0, 10**4, rng=_generator()).mean() - 50) < 0.5
+    assert poisson(3.0, (10, 10), rng=_generator()).shape == (10, 10)
+    poisson_process(2.0, 5.0, 3, rng=_generator())
+    sampler = AdaptiveRejectionSampler(lambda x: -0.5 * x**2, initial_points=[-1.0, 1.0])
+    assert abs(sampler.sample(10**4, rng=_generator()).mean()) < 0.05
+
+
+def test_uniforms_stay_below_one_for_large_moduli():
+    m = 2**64 - 1
+    generator = LCG(m - 2, 1, 0, m)  # constant state m - 2, (m - 2) / m rounds to 1.0 in float
+    assert generator.random() < 1
+    assert np.all(generator.random(100) < 1)
+    assert np.all(np.isfinite(generator.exponential(size=100)))
+    assert np.all(np.isfinite(generator.standard_normal(100)))
+
+
+def test_full_period_check_for_large_moduli():
+    from stochsim.lcg import _prime_factors
+    assert _prime_factors(2**64 - 1) == {3, 5, 17, 257, 641, 65537, 6700417}
+    assert _prime_factors((2**61 - 1) * (2**31 - 1) * 12) == {2, 3, 2**31 - 1, 2**61 - 1}
+    assert not LCG(0, 48271, 1, 2**61 - 1).has_full_period()
+    assert LCG(0, 2 * 3 * 5 * 17 * 257 * 641 * 65537 * 6700417 + 1, 1, 2**64 - 1).has_full_period()
@@ -0,0 +1,33 @@
+import numpy as np
+
+from stochsim.mvn import BlockEquicorrelationSampler, MVNSampler
+
+
+def test_cholesky_sampler_covariance():
+    mu = np.array([1.0, -2.0, 0.5])
+    Sigma = np.array([[2.0, 0.6, -0.4], [0.6, 1.0, 0.2], [-0.4, 0.2, 0.5]])
+    X = MVNSampler(mu, Sigma).sample(200000, rng=np.random.default_rng(0))
+    assert X.shape == (200000, 3)
+    np.testing.assert_allclose(X.mean(axis=0), mu, atol=0.02)
+    np.testing.assert_allclose(np.cov(X, rowvar=False), Sigma, atol=0.03)
+
+
+def test_float32_into_buffer():
+    out = np.empty((1000, 2), dtype=np.float32)
+    result = MVNSampler(np.zeros(2), np.eye(2)).sample(1000, rng=np.random.default_rng(0), dtype=np.float32, out=out)
+    assert result is out
+
+
+def test_block_equicorrelation_covariance():
+    sampler = BlockEquicorrelationSampler(np.zeros(5), [2, 3], [0.8, 0.5], 0.2)
+    X = sampler.sample(200000, rng=np.random.default_rng(1))
+    np.testing.assert_allclose(np.cov(X, rowvar=False), sampler.covariance(), atol=0.02)
+
+
+def test_factor_cache_is_bounded():
+    from stochsim.mvn import CHOLESKY_CACHE_SIZE, _cholesky
+    for scale in range(1, CHOLESKY_CACHE_SIZE + 10):
+        sampler = MVNSampler(np.zeros(2), scale * np.eye(2))
+    np.testing.assert_allclose(sampler.C, np.sqrt(scale) * np.eye(2))
+    assert _cholesky.cache_info().currsize == CHOLESKY_CACHE_SIZE
+    assert MVNSampler(np.zeros(2), scale * np.eye(2)).C is sampler.C
@@ -0,0 +1,10 @@
+import subprocess
+import sys
+
+
+def test_import_is_lightweight():
+    # the package import must not pull in scipy, matplotlib or the process pool machinery
+    code = ("import sys, stochsim; "
+            "print(sorted(m for m in ('scipy', 'matplotlib', 'concurrent.futures', 'statistics') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,48 @@
+import functools
+import numpy as np
+import pytest
+
+from stochsim.parallel import map_blocks, merge_moments, parallel_replications
+from stochsim.pareto import draw_pareto
+
+
+def test_merge_moments_of_pareto_samples():
+    data = draw_pareto(100001, 2.5, 1.0, rng=np.random.default_rng(3))
+    pieces = np.split(data, [1, 17, 50000, 70000])
+    count, mean, m2 = len(pieces[0]), np.mean(pieces[0]), 0.0
+    for piece in pieces[1:]:
+        count, mean, m2 = merge_moments(count, mean, m2, len(piece), np.mean(piece), np.sum((piece - np.mean(piece)) ** 2))
+    assert count == data.size
+    np.testing.assert_allclose(mean, np.mean(data), rtol=1e-12)
+    np.testing.assert_allclose(m2 / (count - 1), np.var(data, ddof=1), rtol=1e-10)
+
+
+def test_parallel_replications_do_not_depend_on_workers():
+    sampler = functools.partial(draw_pareto, alpha=3.0, sigma=2.0)
+    one = parallel_replications(sampler, 50000, seed=5, block_size=7000, n_workers=1)
+    two = parallel_replications(sampler, 50000, seed=5, block_size=7000, n_workers=2)
+    assert one == two
+    mean, variance, count = one
+    # E[X] = sigma / (alpha - 1) for this (Lomax) parametrization
+    assert abs(mean - 1.0) < 5 * np.sqrt(variance)
+
+
+def test_bit_generator_and_validation():
+    sampler = functools.partial(draw_pareto, alpha=3.0, sigma=2.0)
+    philox = parallel_replications(sampler, 20000, seed=5, block_size=7000, n_workers=1, bit_generator="philox")
+    assert philox == parallel_replications(sampler, 20000, seed=5, block_size=7000, n_workers=2, bit_generator="philox")
+    assert philox != parallel_replications(sampler, 20000, seed=5, block_size=7000, n_workers=1)
+    with pytest.raises(ValueError):
+        parallel_replications(sampler, 0)
+    with pytest.raises(ValueError):
+        parallel_replications(sampler, 10, bit_generator="nope")
+
+
+def test_map_blocks_splits_and_seeds_blocks():
+    def draw(count, rng):
+        return rng.random(count)
+
+    blocks = map_blocks(draw, 25, 10, seed=7, n_workers=1, bit_generator="sfc64")
+    assert [block.size for block in blocks] == [10, 10, 5]
+    children = np.random.SeedSequence(7).spawn(3)
+    np.testing.assert_array_equal(blocks[1], np.random.Generator(np.random.SFC64(children[1])).random(10))
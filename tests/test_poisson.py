@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from stochsim.discrete import poisson_log_pmf
+from stochsim.histogram import CountHistogram, goodness_of_fit
+from stochsim.poisson import poisson, poisson_process
+
+
+@pytest.mark.parametrize("lam", [0.0, 0.7, 4.0, 30.0, 1000.0])
+def test_poisson_fits_its_pmf(lam):
+    samples = poisson(lam, 10**6, rng=np.random.default_rng(11))
+    result = goodness_of_fit(CountHistogram().update(samples), lambda k: poisson_log_pmf(lam, k))
+    assert result["ks_scaled"] < 1.63
+    if lam > 0:
+        assert result["p_value"] > 1e-3
+
+
+def test_wrong_rate_is_rejected():
+    samples = poisson(30.0, 10**6, rng=np.random.default_rng(12))
+    result = goodness_of_fit(CountHistogram().update(samples), lambda k: poisson_log_pmf(30.2, k))
+    assert result["p_value"] < 1e-6
+
+
+def test_scalar_and_shape():
+    assert isinstance(poisson(3.0, rng=np.random.default_rng(0)), int)
+    assert poisson(50.0, (4, 5), rng=np.random.default_rng(0)).shape == (4, 5)
+
+
+def test_process_with_zero_rate_has_no_arrivals():
+    arrival_times, counts = poisson_process(0.0, 5.0, 3, rng=np.random.default_rng(0))
+    assert arrival_times.shape == (3, 1) and np.all(np.isnan(arrival_times))
+    np.testing.assert_array_equal(counts, 0)
+
+
+def test_process_with_negative_rate_is_rejected():
+    with pytest.raises(ValueError):
+        poisson_process(-1.0, 5.0, 3)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from stochsim.qmc import SobolSequence, rqmc_integral, sobol_direction_numbers
+
+
+def test_unscrambled_points_match_joe_kuo_reference():
+    from scipy.stats import qmc
+    points = SobolSequence(250, scramble=False).points(0, 1024)
+    reference = qmc.Sobol(250, scramble=False).random(1024)
+    np.testing.assert_array_equal(np.floor(points * 2**30), np.round(reference * 2**30))
+
+
+def test_chunks_agree_with_one_pass():
+    sequence = SobolSequence(5, rng=np.random.default_rng(0))
+    np.testing.assert_array_equal(sequence.points(0, 1000), np.concatenate([sequence.points(0, 300), sequence.points(300, 700)]))
+
+
+def test_too_many_dimensions():
+    with pytest.raises(ValueError):
+        sobol_direction_numbers(10**4)
+
+
+def test_rqmc_beats_plain_monte_carlo_in_50_dimensions():
+    d, n, replicates = 50, 4096, 16
+    mean, standard_error = rqmc_integral(lambda U: np.prod(1 + 0.5 * (U - 0.5), axis=1), d, n, "sobol", replicates, seed=1)
+    rqmc_variance = standard_error**2 * replicates
+    plain_variance = ((1 + 0.25 / 12) ** d - 1) / n
+    assert abs(mean - 1) < 5 * standard_error
+    assert rqmc_variance < plain_variance / 4
@@ -0,0 +1,45 @@
+import numpy as np
+
+from stochsim.tilted import theta_estimators
+from stochsim.variance_reduction import (
+    ControlVariate, antithetic, compare_estimators, plain_estimate, stratified_estimate, uniform_integrand,
+)
+
+THETA = 1.4626517459071816  # int_0^1 exp(x^2) dx
+
+
+def test_every_estimator_is_consistent():
+    rng = np.random.default_rng(0)
+    for name, estimator in theta_estimators().items():
+        estimate, variance = estimator(20000, rng)
+        assert abs(estimate - THETA) < 5 * np.sqrt(variance) + 1e-9, name
+
+
+def test_symmetric_control_after_antithetic_pairing_reduces_variance():
+    h = antithetic(uniform_integrand(lambda u: np.exp(u**2)))
+    rng = np.random.default_rng(1)
+    _, without_control = stratified_estimate(h, 20000, rng=rng)
+    _, odd_control = stratified_estimate(ControlVariate(h, lambda u: u, 0.5), 20000, rng=rng)
+    _, symmetric_control = stratified_estimate(ControlVariate(h, lambda u: (u - 0.5) ** 2, 1 / 12), 20000, rng=rng)
+    assert odd_control > 0.5 * without_control
+    assert symmetric_control < without_control / 20
+
+
+def test_stacked_layers_are_unbiased():
+    rng = np.random.default_rng(2)
+    z = []
+    for _ in range(200):
+        h = ControlVariate(antithetic(lambda u: np.exp(u**2)), lambda u: (u - 0.5) ** 2, 1 / 12)
+        estimate, variance = stratified_estimate(h, 2000, 8, rng=rng)
+        z.append((estimate - THETA) / np.sqrt(variance))
+    assert abs(np.mean(z)) < 4 / np.sqrt(len(z))
+    assert 0.6 < np.std(z) < 1.5
+
+
+def test_compare_estimators():
+    rows = compare_estimators({"plain": lambda n, rng: plain_estimate(np.exp, n, rng=rng),
+                               "antithetic": lambda n, rng: plain_estimate(antithetic(np.exp), n // 2, rng=rng)},
+                              10000, repeats=2, rng=np.random.default_rng(3))
+    assert [row["name"] for row in rows] == ["plain", "antithetic"]
+    assert rows[0]["relative_efficiency"] == 1.0
+    assert all(row["variance"] > 0 and row["seconds"] > 0 for row in rows)